@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""Benchmark clean-navidrome-ratings.py against a local fake Navidrome.
+
+Starts a stand-in server that implements getAlbumList2, /api/song,
+/auth/login and startScan with configurable latency and a synthetic
+library. For each library size it then runs the tool itself with
+--execute against the server, once per variant:
+
+    no-catalog    --no-catalog, everything fetched from the server
+    catalog-cold  a fresh --catalog, so the run does a full refresh
+    catalog-warm  --catalog primed by an unmeasured dry run (delta sync)
+
+Wall time, request count and peak RSS per phase come from the tool's
+--metrics-json, which samples RSS as each phase ends; the run's overall
+peak RSS comes from the tool process's own resource usage.
+
+Usage:
+    ./scripts/bench-navidrome-cleanup.py
+    ./scripts/bench-navidrome-cleanup.py --sizes 1000 10000 --latency-ms 5
+    ./scripts/bench-navidrome-cleanup.py --output new.json --compare baseline.json
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+TOOL_PATH = Path(__file__).resolve().parent / "clean-navidrome-ratings.py"
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_LATENCY_MS = 2.0
+DEFAULT_SONGS_PER_ALBUM = 10
+DEFAULT_FILES_PER_ALBUM = 2
+DEFAULT_FILE_SIZE = 4096
+DEFAULT_THRESHOLD = 0.2
+GENRES = ["Ambient", "Electronic", "Jazz", "Metal", "Rock"]
+# Share of albums per userRating 0..5
+RATING_WEIGHTS = [60, 8, 8, 8, 8, 8]
+# Phases reported in the tool's --metrics-json, in run order
+PHASES = ["auth", "fetch", "filter", "plan", "delete", "rescan"]
+VARIANTS = ["no-catalog", "catalog-cold", "catalog-warm"]
+MIN_RATING = 1
+MAX_RATING = 2
+
+
+class FakeLibrary:
+    """Synthetic library whose albums and songs are generated on demand.
+
+    Album i has songs_per_album songs, and the global song list is sorted
+    by album, so any /api/song window can be computed from indexes without
+    materializing a million dicts.
+    """
+
+    def __init__(self, size: int, songs_per_album: int, seed: int = 0) -> None:
+        self.size = size
+        self.songs_per_album = songs_per_album
+        rng = random.Random(seed)
+        self.ratings = bytes(
+            rng.choices(range(len(RATING_WEIGHTS)), RATING_WEIGHTS, k=size)
+        )
+        self.highest = sorted(
+            (i for i in range(size) if self.ratings[i]),
+            key=lambda i: (-self.ratings[i], i),
+        )
+
+    def album(self, index: int) -> dict:
+        return {
+            "id": f"al-{index:07d}",
+            "name": f"Album {index:07d}",
+            "artist": f"Artist {index % 1000:04d}",
+            "year": 1970 + index % 50,
+            "genre": GENRES[index % len(GENRES)],
+            "songCount": self.songs_per_album,
+            "userRating": self.ratings[index],
+        }
+
+    def relative_dir(self, index: int) -> str:
+        album = self.album(index)
+        return f"{album['genre']}/{album['artist']}/({album['year']}) {album['name']}"
+
+    def song(self, position: int) -> dict:
+        index, track = divmod(position, self.songs_per_album)
+        album_id = f"al-{index:07d}"
+        return {
+            "id": f"{album_id}-{track:02d}",
+            "albumId": album_id,
+            "album": f"Album {index:07d}",
+            "title": f"Track {track:02d}",
+            "path": f"{self.relative_dir(index)}/{track + 1:02d} - Track {track:02d}.flac",
+        }
+
+    def album_list(self, list_type: str, offset: int, size: int) -> list[dict]:
+        if list_type == "highest":
+            indexes = self.highest[offset : offset + size]
+        elif list_type == "newest":
+            indexes = range(
+                self.size - 1 - offset, max(-1, self.size - 1 - offset - size), -1
+            )
+        else:
+            indexes = range(offset, min(self.size, offset + size))
+        return [self.album(i) for i in indexes]
+
+    def songs(self, start: int, end: int, album_id: str | None) -> list[dict]:
+        if album_id is not None:
+            index = int(album_id.removeprefix("al-"))
+            if not 0 <= index < self.size:
+                return []
+            first = index * self.songs_per_album
+            last = first + self.songs_per_album
+            start, end = first + start, min(last, first + end)
+        else:
+            end = min(end, self.size * self.songs_per_album)
+        return [self.song(position) for position in range(start, end)]
+
+
+def make_handler(library: FakeLibrary, latency: float) -> type[BaseHTTPRequestHandler]:
+    """Build a request handler bound to library with a fixed per-request delay."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+        def send_json(self, endpoint: str, payload: object) -> None:
+            time.sleep(latency)
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body, compresslevel=1)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def subsonic(self, endpoint: str, payload: dict) -> None:
+            self.send_json(
+                endpoint,
+                {
+                    "subsonic-response": {
+                        "status": "ok",
+                        "version": "1.16.1",
+                        **payload,
+                    }
+                },
+            )
+
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.path == "/auth/login":
+                self.send_json("auth/login", {"token": "bench-token"})
+            else:
+                self.send_error(404)
+
+        def do_GET(self) -> None:
+            url = urlsplit(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            endpoint = url.path.removeprefix("/rest/").removesuffix(".view")
+            if endpoint == "getAlbumList2":
+                albums = library.album_list(
+                    query.get("type", "alphabeticalByName"),
+                    int(query.get("offset", 0)),
+                    int(query.get("size", 10)),
+                )
+                self.subsonic(endpoint, {"albumList2": {"album": albums}})
+            elif endpoint in ("startScan", "getScanStatus"):
+                songs = library.size * library.songs_per_album
+                self.subsonic(
+                    endpoint, {"scanStatus": {"scanning": False, "count": songs}}
+                )
+            elif url.path == "/api/song":
+                songs = library.songs(
+                    int(query.get("_start", 0)),
+                    int(query.get("_end", library.songs_per_album)),
+                    query.get("album_id"),
+                )
+                self.send_json("song", songs)
+            else:
+                self.send_error(404)
+
+    return Handler
+
+
+def serve(args: argparse.Namespace) -> None:
+    """Run the fake server until killed, printing its port once listening."""
+    library = FakeLibrary(args.size, args.songs_per_album, args.seed)
+    handler = make_handler(library, args.latency_ms / 1000)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    print(server.server_address[1], flush=True)
+    server.serve_forever()
+
+
+def rss_mb(maxrss: int) -> float:
+    """Convert ru_maxrss to MB."""
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return maxrss / 1024**2 if sys.platform == "darwin" else maxrss / 1024
+
+
+def create_music_tree(
+    library: FakeLibrary, music_root: Path, files_per_album: int, file_size: int
+) -> int:
+    """Create directories for the albums the benchmark will delete."""
+    payload = b"\0" * file_size
+    created = 0
+    for index in range(library.size):
+        if not MIN_RATING <= library.ratings[index] <= MAX_RATING:
+            continue
+        album_dir = music_root / library.relative_dir(index)
+        album_dir.mkdir(parents=True, exist_ok=True)
+        for track in range(files_per_album):
+            (album_dir / f"{track + 1:02d}.flac").write_bytes(payload)
+        created += 1
+    return created
+
+
+def run_tool(tool_args: list[str], log_path: Path) -> tuple[float, float]:
+    """Run clean-navidrome-ratings.py and return (wall seconds, peak RSS MB).
+
+    Output goes to log_path, so printing does not block the run and is
+    available when the tool fails.
+    """
+    env = {**os.environ, "NAVIDROME_USER": "bench", "NAVIDROME_PASSWORD": "bench"}
+    start = time.perf_counter()
+    with log_path.open("w") as log:
+        process = subprocess.Popen(
+            [sys.executable, str(TOOL_PATH), *tool_args],
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            env=env,
+        )
+        # wait4 reports the usage of this child alone
+        _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        sys.exit(f"Tool failed:\n{log_path.read_text()[-2000:]}")
+    return wall, rss_mb(usage.ru_maxrss)
+
+
+def measure_variant(
+    variant: str, library: FakeLibrary, base_url: str, args: argparse.Namespace
+) -> dict:
+    """Run one variant of the cleanup against the fake server."""
+    with tempfile.TemporaryDirectory(prefix="navidrome-bench-") as tmp:
+        tmp_path = Path(tmp)
+        music_root = tmp_path / "music"
+        create_music_tree(library, music_root, args.files_per_album, args.file_size)
+        metrics_path = tmp_path / "metrics.json"
+        common = [
+            "--url",
+            base_url,
+            "--music-root",
+            str(music_root),
+            "--min-rating",
+            str(MIN_RATING),
+            "--max-rating",
+            str(MAX_RATING),
+            "--resolve",
+            args.resolve,
+            "--concurrency",
+            str(args.concurrency),
+            "--delete-workers",
+            str(args.delete_workers),
+        ]
+        if variant == "no-catalog":
+            common.append("--no-catalog")
+        else:
+            common += ["--catalog", str(tmp_path / "catalog.sqlite3")]
+        if variant == "catalog-warm":
+            run_tool(common, tmp_path / "prime.log")
+
+        wall, peak_rss = run_tool(
+            [*common, "--execute", "--metrics-json", str(metrics_path)],
+            tmp_path / "run.log",
+        )
+        metrics = json.loads(metrics_path.read_text())
+        endpoints = {
+            name: stats["requests"] for name, stats in metrics["endpoints"].items()
+        }
+        remaining = sum(
+            1
+            for index in range(library.size)
+            if MIN_RATING <= library.ratings[index] <= MAX_RATING
+            and (music_root / library.relative_dir(index)).exists()
+        )
+
+    # Filter runs inside the fetch pipeline, so a phase without its own
+    # RSS sample carries the previous one forward
+    phases = {}
+    rss = 0.0
+    for phase in PHASES:
+        rss = metrics["phase_peak_rss_mb"].get(phase, rss)
+        phases[phase] = {
+            "wall_s": metrics["phases"].get(phase, 0.0),
+            "requests": metrics["phase_requests"].get(phase, 0),
+            "peak_rss_mb": rss,
+        }
+    return {
+        "wall_s": round(wall, 4),
+        "peak_rss_mb": round(peak_rss, 1),
+        "requests": sum(endpoints.values()),
+        "endpoints": endpoints,
+        "phases": phases,
+        "remaining_dirs": remaining,
+    }
+
+
+def run_size(size: int, args: argparse.Namespace) -> dict:
+    """Start a fake server for one library size and measure each variant."""
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            __file__,
+            "--role",
+            "serve",
+            "--latency-ms",
+            str(args.latency_ms),
+            "--size",
+            str(size),
+            "--songs-per-album",
+            str(args.songs_per_album),
+            "--seed",
+            str(args.seed),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        port = int(server.stdout.readline())
+        with socket.create_connection(("127.0.0.1", port), timeout=10):
+            pass
+        library = FakeLibrary(size, args.songs_per_album, args.seed)
+        base_url = f"http://127.0.0.1:{port}"
+        return {
+            variant: measure_variant(variant, library, base_url, args)
+            for variant in args.variants
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def print_results(results: dict[str, dict]) -> None:
+    """Print one row per size, variant and phase, then the run's totals."""
+    print(
+        f"{'albums':>8}  {'variant':<13} {'phase':<7} {'wall':>9} "
+        f"{'requests':>9} {'peak RSS':>10}"
+    )
+    for size, variants in results.items():
+        for variant, stats in variants.items():
+            prefix = f"{int(size):>8}  {variant:<13}"
+            for phase in PHASES:
+                phase_stats = stats["phases"][phase]
+                print(
+                    f"{prefix} {phase:<7} {phase_stats['wall_s']:>8.3f}s "
+                    f"{phase_stats['requests']:>9} "
+                    f"{phase_stats['peak_rss_mb']:>7.1f} MB"
+                )
+            print(
+                f"{prefix} {'total':<7} {stats['wall_s']:>8.3f}s "
+                f"{stats['requests']:>9} {stats['peak_rss_mb']:>7.1f} MB "
+                f"({stats['remaining_dirs']} dirs left)"
+            )
+
+
+def compare_results(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Return regressions where wall time or requests grew beyond threshold."""
+    regressions = []
+    for size, variants in results.items():
+        for variant, new in variants.items():
+            old = baseline.get(size, {}).get(variant)
+            if not old:
+                continue
+            runs = [("total", old, new)]
+            runs += [
+                (phase, old["phases"].get(phase, {}), new["phases"][phase])
+                for phase in PHASES
+            ]
+            for name, before, after in runs:
+                for metric in ("wall_s", "requests"):
+                    if metric not in before:
+                        continue
+                    # Ignore noise on phases that take a few milliseconds
+                    floor = 0.05 if metric == "wall_s" else 0
+                    if after[metric] > max(before[metric] * (1 + threshold), floor):
+                        regressions.append(
+                            f"{size} albums, {variant}, {name}: {metric} "
+                            f"{before[metric]} -> {after[metric]}"
+                        )
+    return regressions
+
+
+def main() -> None:
+    """Entry point: run the benchmark, or act as its server child."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark clean-navidrome-ratings.py against a fake server."
+    )
+    parser.add_argument("--role", default="run", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Library sizes in albums (default: 1000 10000 100000)",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=DEFAULT_LATENCY_MS,
+        help=f"Server latency per request (default: {DEFAULT_LATENCY_MS:g})",
+    )
+    parser.add_argument(
+        "--songs-per-album",
+        type=int,
+        default=DEFAULT_SONGS_PER_ALBUM,
+        help=f"Songs per album (default: {DEFAULT_SONGS_PER_ALBUM})",
+    )
+    parser.add_argument(
+        "--files-per-album",
+        type=int,
+        default=DEFAULT_FILES_PER_ALBUM,
+        help=f"Files created per deleted album (default: {DEFAULT_FILES_PER_ALBUM})",
+    )
+    parser.add_argument(
+        "--file-size",
+        type=int,
+        default=DEFAULT_FILE_SIZE,
+        help=f"Bytes per created file (default: {DEFAULT_FILE_SIZE})",
+    )
+    parser.add_argument(
+        "--resolve",
+        default="auto",
+        help="Path resolution mode passed to the tool (default: auto)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Parallel path lookups (default: 8)",
+    )
+    parser.add_argument(
+        "--delete-workers",
+        type=int,
+        default=4,
+        help="Parallel album deletions (default: 4)",
+    )
+    parser.add_argument(
+        "--variants",
+        nargs="+",
+        choices=VARIANTS,
+        default=VARIANTS,
+        help="Catalog variants to run (default: all)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Library random seed")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="Baseline JSON to check for regressions (exit 1 if any)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed slowdown before flagging (default: {DEFAULT_THRESHOLD:g})",
+    )
+    args = parser.parse_args()
+
+    if args.role == "serve":
+        serve(args)
+        return
+
+    results = {}
+    for size in args.sizes:
+        print(f"Benchmarking {size} albums...", file=sys.stderr)
+        results[str(size)] = run_size(size, args)
+    print_results(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
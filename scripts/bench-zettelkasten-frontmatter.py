@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Micro-benchmark frontmatter parsing in convert-to-zettelkasten.py.
+
+Compares the single-pass scanner (parse_frontmatter, read_frontmatter)
+against the previous DOTALL regex parser on synthetic notes with flow
+lists, block lists, nested maps and bodies of configurable size. Reports
+time per note for in-memory parsing and for reading notes from disk
+(whole file vs header only), plus how many notes keep every frontmatter
+line and every alias when the block is rebuilt.
+
+Usage:
+    ./scripts/bench-zettelkasten-frontmatter.py
+    ./scripts/bench-zettelkasten-frontmatter.py --notes 5000 --body-kb 32
+"""
+
+import argparse
+import importlib.util
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+
+TOOL_PATH = Path(__file__).resolve().parent / "convert-to-zettelkasten.py"
+DEFAULT_NOTES = 2000
+DEFAULT_BODY_KB = 8
+DEFAULT_REPEAT = 5
+SKIP_KEYS = {"title", "tags", "aliases", "created"}
+
+
+def load_tool():
+    spec = importlib.util.spec_from_file_location("convert_to_zettelkasten", TOOL_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_parse_frontmatter(content: str) -> tuple[dict | None, str, str]:
+    """Parser as it was before the single-pass scanner."""
+    if not content.startswith("---"):
+        return None, "", content
+
+    match = re.match(r"^---\n(.*?)\n---\n?", content, re.DOTALL)
+    if not match:
+        return None, "", content
+
+    frontmatter_raw = match.group(1)
+    body = content[match.end() :]
+
+    fm = {}
+    for line in frontmatter_raw.split("\n"):
+        if ":" in line:
+            key, _, value = line.partition(":")
+            fm[key.strip()] = value.strip()
+
+    return fm, frontmatter_raw, body
+
+
+def legacy_extra(fm: dict) -> str:
+    """Extra keys as the old build_frontmatter wrote them back."""
+    return "".join(
+        f"{key}: {value}\n" for key, value in fm.items() if key.lower() not in SKIP_KEYS
+    )
+
+
+def aliases_of(tool, entries: dict) -> list[str]:
+    """Casefolded aliases in parsed frontmatter entries."""
+    value = tool.frontmatter_value(entries["aliases"]) if "aliases" in entries else []
+    return [
+        alias.casefold() for alias in ([value] if isinstance(value, str) else value)
+    ]
+
+
+def make_note(rng: random.Random, index: int, body_kb: int) -> str:
+    """Generate one note; roughly one in five has no frontmatter."""
+    body = "".join(
+        f"Line {i} of note {index} with a [[link {rng.randrange(1000)}]].\n"
+        for i in range(body_kb * 1024 // 48)
+    )
+    kind = index % 5
+    if kind == 0:
+        return body
+    lines = ["---"]
+    if kind == 1:
+        lines += [f"title: Note {index}", "tags: [a, b]"]
+    elif kind == 2:
+        lines += ["aliases:", f"  - Note {index}", "  - other", "tags:", "  - x"]
+    elif kind == 3:
+        lines += [
+            f"aliases: [\"Note, {index}\", 'b']",
+            "related:",
+            '  - "[[A]]"',
+            "  - url: https://example.com/a:b",
+        ]
+    else:
+        lines += [
+            "# comment",
+            f"title: Note {index}",
+            "meta:",
+            "  source: web",
+            "  rating: 5",
+            "cssclasses: [wide]",
+        ]
+    lines.append("---")
+    return "\n".join(lines) + "\n" + body
+
+
+def best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark frontmatter parsing in convert-to-zettelkasten.py"
+    )
+    parser.add_argument(
+        "--notes",
+        type=int,
+        default=DEFAULT_NOTES,
+        help=f"Synthetic notes (default: {DEFAULT_NOTES})",
+    )
+    parser.add_argument(
+        "--body-kb",
+        type=int,
+        default=DEFAULT_BODY_KB,
+        help=f"Body size per note in KiB (default: {DEFAULT_BODY_KB})",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Runs per measurement, best is kept (default: {DEFAULT_REPEAT})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    tool = load_tool()
+    rng = random.Random(args.seed)
+    notes = [make_note(rng, i, args.body_kb) for i in range(args.notes)]
+
+    # Every original frontmatter line other than the rebuilt keys should
+    # survive a rebuild, and so should every existing alias
+    kept_legacy = kept_new = 0
+    for content in notes:
+        fm, _, _ = legacy_parse_frontmatter(content)
+        entries, _, _ = tool.parse_frontmatter(content)
+        if fm is None:
+            kept_legacy += 1
+            kept_new += entries is None
+            continue
+        rebuilt = tool.build_frontmatter("t", "📝", "20240101120000", entries)
+        expected = [
+            line
+            for key, entry in entries.items()
+            if key.lower() not in SKIP_KEYS
+            for line in entry.splitlines()
+        ]
+        aliases = set(aliases_of(tool, entries))
+        # The old build_frontmatter wrote the title as the only alias
+        kept_legacy += set(expected) <= set(legacy_extra(fm).splitlines()) and (
+            aliases <= {"t"}
+        )
+        rebuilt_entries, _, _ = tool.parse_frontmatter(rebuilt)
+        kept_new += set(expected) <= set(rebuilt.splitlines()) and aliases <= set(
+            aliases_of(tool, rebuilt_entries)
+        )
+
+    results = {
+        "parse (memory)": (
+            best_of(args.repeat, lambda: [legacy_parse_frontmatter(c) for c in notes]),
+            best_of(args.repeat, lambda: [tool.parse_frontmatter(c) for c in notes]),
+        )
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, content in enumerate(notes):
+            path = Path(tmp) / f"{i:06d}.md"
+            path.write_text(content, encoding="utf-8")
+            paths.append(path)
+        results["read + parse (disk)"] = (
+            best_of(
+                args.repeat,
+                lambda: [
+                    legacy_parse_frontmatter(p.read_text(encoding="utf-8"))
+                    for p in paths
+                ],
+            ),
+            best_of(args.repeat, lambda: [tool.read_frontmatter(p) for p in paths]),
+        )
+
+    print(f"{args.notes} notes, {args.body_kb} KiB body, best of {args.repeat}\n")
+    print(f"{'':<22} {'regex':>10} {'scanner':>10} {'speedup':>8}")
+    for name, (legacy, new) in results.items():
+        per_legacy = legacy / args.notes * 1e6
+        per_new = new / args.notes * 1e6
+        speedup = legacy / new if new else float("inf")
+        print(f"{name:<22} {per_legacy:>8.1f}µs {per_new:>8.1f}µs {speedup:>7.1f}x")
+    print()
+    print(
+        f"Frontmatter kept on rebuild: regex {kept_legacy}/{args.notes}, "
+        f"scanner {kept_new}/{args.notes}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""Benchmark convert-to-zettelkasten.py on synthetic vaults.
+
+Generates a vault per size with a mix of frontmatter shapes, configurable
+body sizes, wikilink density and notes sharing a creation second, then
+runs the conversion phases (discovery, parse, plan, build, links) as a
+dry run and again for real (write, links), recording wall time and peak
+RSS per phase. Each size is measured in a fresh process so RSS numbers
+are not polluted by generation or by earlier sizes.
+
+ctime cannot be set on Linux, so the measuring process maps each note to
+a synthetic creation second instead: --collision-group notes share one.
+
+Usage:
+    ./scripts/bench-zettelkasten.py
+    ./scripts/bench-zettelkasten.py --sizes 1000 10000 --jobs 4
+    ./scripts/bench-zettelkasten.py --output new.json --compare baseline.json
+    ./scripts/bench-zettelkasten.py --generate /tmp/vault --sizes 5000
+"""
+
+import argparse
+import atexit
+import contextlib
+import importlib
+import io
+import json
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+TOOL_PATH = Path(__file__).resolve().parent / "convert-to-zettelkasten.py"
+TOOL_MODULE = "convert_to_zettelkasten"
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_BODY_KB = 2
+DEFAULT_LINKS = 5
+DEFAULT_COLLISION_GROUP = 20
+DEFAULT_THRESHOLD = 0.2
+FRONTMATTER_SHAPES = ["none", "flow", "block", "nested"]
+# Relative share of notes generated in each directory
+DIRS = [("inbox", 25), ("notes", 50), ("notes/projects", 15), ("notes/areas/work", 10)]
+DIR_NAMES = ["inbox", "notes"]
+MODES = {
+    "dry-run": ["discovery", "parse", "plan", "build", "links"],
+    "execute": ["write", "links"],
+}
+BASE_TIME = datetime(2024, 1, 1)
+
+
+def note_title(index: int) -> str:
+    return f"Note {index:07d} about topic {index % 97}"
+
+
+def note_frontmatter(index: int, shape: str) -> str:
+    """Frontmatter block for one note in the given shape."""
+    if shape == "none":
+        return ""
+    if shape == "flow":
+        lines = [f"title: {note_title(index)}", "tags: [a, b]"]
+    elif shape == "block":
+        lines = ["aliases:", f"  - {note_title(index)}", "  - other", "tags:", "  - x"]
+    else:
+        lines = [
+            "# imported",
+            f'aliases: ["{note_title(index)}", other]',
+            "source:",
+            "  url: https://example.com/a:b",
+            "  rating: 5",
+            "cssclasses: [wide]",
+        ]
+    return "---\n" + "\n".join(lines) + "\n---\n"
+
+
+def generate_vault(
+    root: Path, size: int, body_kb: int, links: int, shapes: list[str], seed: int
+) -> None:
+    """Write a synthetic vault of size notes under root."""
+    rng = random.Random(seed)
+    directories = [name for name, _ in DIRS]
+    weights = [weight for _, weight in DIRS]
+    for name in directories:
+        (root / name).mkdir(parents=True, exist_ok=True)
+    # Ignored content the walker has to skip
+    (root / ".obsidian").mkdir(exist_ok=True)
+    (root / ".obsidian" / "workspace.md").write_text("ignored\n")
+    (root / "notes" / "attachments").mkdir(exist_ok=True)
+
+    filler = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+    body_lines = max(1, body_kb * 1024 // len(filler))
+    for index in range(size):
+        link_line = " ".join(
+            f"[[{note_title(rng.randrange(size))}]]" for _ in range(links)
+        )
+        body = (
+            f"# {note_title(index)}\n\n{link_line}\n\n" + (filler + "\n") * body_lines
+        )
+        directory = rng.choices(directories, weights)[0]
+        shape = shapes[index % len(shapes)]
+        (root / directory / f"{note_title(index)}.md").write_text(
+            note_frontmatter(index, shape) + body, encoding="utf-8"
+        )
+
+
+def load_tool():
+    """Import convert-to-zettelkasten.py, whose filename is not importable.
+
+    It is imported through a symlink with an importable name in a
+    temporary directory on sys.path. --jobs workers inherit sys.path even
+    when they are spawned rather than forked (the macOS default), so they
+    can import the tool to unpickle its functions.
+    """
+    alias_dir = Path(tempfile.mkdtemp(prefix="bench-zettelkasten-"))
+    atexit.register(shutil.rmtree, alias_dir, ignore_errors=True)
+    (alias_dir / f"{TOOL_MODULE}.py").symlink_to(TOOL_PATH)
+    sys.path.insert(0, str(alias_dir))
+    return importlib.import_module(TOOL_MODULE)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def measure(args: argparse.Namespace) -> None:
+    """Run the conversion phases once over an existing vault.
+
+    Prints one JSON object with wall time and peak RSS for each mode and
+    phase. Tool output is discarded so printing does not dominate.
+    """
+    tool = load_tool()
+
+    def synthetic_ctime(path: Path) -> str:
+        index = int(path.stem.split()[1])
+        second = BASE_TIME + timedelta(seconds=index // args.collision_group)
+        return second.strftime("%Y%m%d%H%M%S")
+
+    tool.get_creation_time = synthetic_ctime
+
+    vault = args.vault
+    roots = [vault / name for name in DIR_NAMES]
+    dir_tags = dict(tool.DIR_TAGS)
+    state: dict = {}
+
+    def run_discovery() -> None:
+        state["paths"] = [
+            path
+            for root in roots
+            for path in tool.walk_notes(root, tool.IGNORE_PATTERNS)
+        ]
+
+    def run_parse() -> None:
+        state["headers"] = [tool.read_frontmatter(path) for path in state["paths"]]
+
+    def run_plan() -> None:
+        allocator = tool.NameAllocator()
+        tasks = []
+        for path in state["paths"]:
+            rel_dir = path.parent.relative_to(vault).as_posix()
+            tag = tool.tag_for_dir(rel_dir, dir_tags)
+            task = tool.plan_note(path, tag, False, allocator)
+            if not task.get("skipped"):
+                tasks.append(task)
+        state["tasks"] = tasks
+
+    def run_build() -> None:
+        state["results"] = tool.convert_all(state["tasks"], True, args.jobs)
+
+    def run_write() -> None:
+        state["results"] = tool.convert_all(state["tasks"], False, args.jobs)
+
+    def run_links(dry_run: bool) -> None:
+        notes = list(tool.walk_notes(vault, tool.IGNORE_PATTERNS))
+        link_map = tool.build_link_map(state["results"], vault, notes)
+        state["links"] = sum(
+            r["links"] for r in tool.rewrite_all(notes, link_map, dry_run, args.jobs)
+        )
+
+    steps = {
+        "dry-run": {
+            "discovery": run_discovery,
+            "parse": run_parse,
+            "plan": run_plan,
+            "build": run_build,
+            "links": lambda: run_links(True),
+        },
+        "execute": {
+            "write": run_write,
+            "links": lambda: run_links(False),
+        },
+    }
+    modes = {}
+    for mode, phases in MODES.items():
+        modes[mode] = {}
+        for phase in phases:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                steps[mode][phase]()
+            modes[mode][phase] = {
+                "wall_s": round(time.perf_counter() - start, 4),
+                "peak_rss_mb": round(peak_rss_mb(), 1),
+            }
+        modes[mode]["links"]["links"] = state["links"]
+    modes["dry-run"]["discovery"]["notes"] = len(state["paths"])
+    modes["execute"]["write"]["renamed"] = sum(
+        1 for r in state["results"] if r["new_path"] != r["path"]
+    )
+
+    print(json.dumps(modes))
+
+
+def run_size(size: int, args: argparse.Namespace) -> dict:
+    """Generate a vault for one size and measure it in a child process."""
+    with tempfile.TemporaryDirectory(prefix="zettelkasten-bench-") as tmp:
+        vault = Path(tmp)
+        generate_vault(vault, size, args.body_kb, args.links, args.shapes, args.seed)
+        result = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--role",
+                "measure",
+                "--vault",
+                str(vault),
+                "--jobs",
+                str(args.jobs),
+                "--collision-group",
+                str(args.collision_group),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    return json.loads(result.stdout)
+
+
+def print_results(results: dict[str, dict]) -> None:
+    """Print one table row per vault size, mode and phase."""
+    print(f"{'notes':>8}  {'mode':<8} {'phase':<10} {'wall':>9} {'peak RSS':>10}")
+    for size, modes in results.items():
+        for mode, phases in MODES.items():
+            for phase in phases:
+                stats = modes[mode][phase]
+                print(
+                    f"{int(size):>8}  {mode:<8} {phase:<10} {stats['wall_s']:>8.3f}s "
+                    f"{stats['peak_rss_mb']:>7.1f} MB"
+                )
+            total = sum(modes[mode][phase]["wall_s"] for phase in phases)
+            print(f"{int(size):>8}  {mode:<8} {'total':<10} {total:>8.3f}s")
+
+
+def compare_results(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Return regressions where wall time or peak RSS grew beyond threshold."""
+    regressions = []
+    for size, modes in results.items():
+        for mode, phases in MODES.items():
+            for phase in phases:
+                old = baseline.get(size, {}).get(mode, {}).get(phase)
+                if not old:
+                    continue
+                new = modes[mode][phase]
+                for metric, floor in (("wall_s", 0.05), ("peak_rss_mb", 0)):
+                    # Ignore noise on phases that take a few milliseconds
+                    if new[metric] > max(old[metric] * (1 + threshold), floor):
+                        regressions.append(
+                            f"{size} notes, {mode} {phase}: {metric} "
+                            f"{old[metric]} -> {new[metric]}"
+                        )
+    return regressions
+
+
+def main() -> None:
+    """Entry point: run the benchmark, generate a vault, or measure one."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark convert-to-zettelkasten.py on synthetic vaults."
+    )
+    parser.add_argument("--role", default="run", help=argparse.SUPPRESS)
+    parser.add_argument("--vault", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Vault sizes in notes (default: 1000 10000 100000)",
+    )
+    parser.add_argument(
+        "--body-kb",
+        type=int,
+        default=DEFAULT_BODY_KB,
+        help=f"Body size per note in KiB (default: {DEFAULT_BODY_KB})",
+    )
+    parser.add_argument(
+        "--links",
+        type=int,
+        default=DEFAULT_LINKS,
+        help=f"Wikilinks per note (default: {DEFAULT_LINKS})",
+    )
+    parser.add_argument(
+        "--shapes",
+        nargs="+",
+        choices=FRONTMATTER_SHAPES,
+        default=FRONTMATTER_SHAPES,
+        help="Frontmatter shapes, assigned round robin (default: all)",
+    )
+    parser.add_argument(
+        "--collision-group",
+        type=int,
+        default=DEFAULT_COLLISION_GROUP,
+        help=f"Notes sharing one creation second (default: {DEFAULT_COLLISION_GROUP})",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes passed to the converter (default: 1)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Vault random seed")
+    parser.add_argument(
+        "--generate",
+        type=Path,
+        metavar="DIR",
+        help="Only write a vault of the first --sizes entry to DIR",
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="Baseline JSON to check for regressions (exit 1 if any)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed slowdown before flagging (default: {DEFAULT_THRESHOLD:g})",
+    )
+    args = parser.parse_args()
+
+    if args.role == "measure":
+        measure(args)
+        return
+
+    if args.generate:
+        size = args.sizes[0]
+        generate_vault(
+            args.generate, size, args.body_kb, args.links, args.shapes, args.seed
+        )
+        print(f"Generated {size} notes in {args.generate}")
+        return
+
+    results = {}
+    for size in args.sizes:
+        print(f"Benchmarking {size} notes...", file=sys.stderr)
+        results[str(size)] = run_size(size, args)
+    print_results(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,15 +10,25 @@ Usage:
 """
 
 import argparse
+import contextlib
+import errno
+import gzip
 import hashlib
+import http.client
 import json
+import math
 import os
+import random
+import resource
 import secrets
-import shutil
+import sqlite3
 import sys
+import threading
 import time
 import urllib.parse
-import urllib.request
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 DEFAULT_URL = os.environ.get("NAVIDROME_URL", "http://localhost:4533")
@@ -26,6 +36,52 @@ DEFAULT_MUSIC_ROOT = "/Volumes/archive/music/Library"
 SUBSONIC_API_VERSION = "1.16.1"
 SUBSONIC_CLIENT = "navidrome-cleanup"
 PAGE_SIZE = 500
+# Album pages adapt between these sizes to take about TARGET_PAGE_SECONDS
+MIN_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 2000
+TARGET_PAGE_SECONDS = 0.5
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 4
+DEFAULT_SCAN_TIMEOUT = 1800.0
+DEFAULT_FULL_SCAN_THRESHOLD = 1000
+SCAN_POLL_INITIAL = 0.5
+SCAN_POLL_MAX = 10.0
+SCAN_MODES = ("auto", "quick", "full")
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 10.0
+INITIAL_CONCURRENCY = 2
+# A response counts as healthy within this factor (plus slack, in seconds)
+# of the fastest response seen for the same endpoint
+LATENCY_TOLERANCE = 3.0
+LATENCY_SLACK = 0.02
+DEFAULT_DELETE_WORKERS = 4
+DEFAULT_SCAN_WORKERS = 8
+# Album directories sit at Genre/Artist/(year) Album below the music root
+ALBUM_DEPTH = 3
+QUARANTINE_BATCH_FORMAT = "%Y%m%d-%H%M%S"
+SONG_WINDOW = 5000
+# One bulk window of SONG_WINDOW songs costs roughly this many per-album lookups
+BULK_WINDOW_COST = 25
+RESOLVE_MODES = ("auto", "album", "bulk")
+DEFAULT_CATALOG = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "navidrome-cleanup"
+    / "catalog.sqlite3"
+)
+CATALOG_MAX_AGE_DAYS = 7.0
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS albums (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    artist TEXT NOT NULL,
+    name TEXT NOT NULL,
+    rating INTEGER NOT NULL,
+    song_count INTEGER NOT NULL,
+    relative_dir TEXT
+);
+"""
 
 
 def generate_subsonic_params(username: str, password: str) -> dict[str, str]:
@@ -42,23 +98,335 @@ def generate_subsonic_params(username: str, password: str) -> dict[str, str]:
     }
 
 
-def get_native_token(base_url: str, username: str, password: str) -> str:
+def endpoint_name(path: str) -> str:
+    """Short endpoint label for a request path, e.g. getAlbumList2 or song."""
+    path = path.partition("?")[0]
+    if path.startswith("/rest/"):
+        return path.removeprefix("/rest/").removesuffix(".view")
+    return path.removeprefix("/api/").lstrip("/")
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+class Metrics:
+    """Thread-safe request and phase timings for --timings/--metrics-json.
+
+    Requests are also counted per phase: each one is charged to the phase
+    that is active (see tagged) when it completes, whichever thread sends it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = {}
+        self.bytes: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        self.phases: dict[str, float] = {}
+        self.active = "other"
+        self.phase_requests: dict[str, int] = {}
+        self.phase_rss: dict[str, float] = {}
+
+    def record_request(
+        self, endpoint: str, seconds: float, byte_count: int, ok: bool = True
+    ) -> None:
+        with self._lock:
+            self.phase_requests[self.active] = (
+                self.phase_requests.get(self.active, 0) + 1
+            )
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            self.bytes[endpoint] = self.bytes.get(endpoint, 0) + byte_count
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def tagged(self, name: str) -> Iterator[None]:
+        """Charge requests in the with-block to phase name, then sample RSS."""
+        previous = self.active
+        self.active = name
+        try:
+            yield
+        finally:
+            self.active = previous
+            with self._lock:
+                self.phase_rss[name] = peak_rss_mb()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the with-block to phase name."""
+        start = time.monotonic()
+        try:
+            with self.tagged(name):
+                yield
+        finally:
+            self.add_phase(name, time.monotonic() - start)
+
+    def summary(self) -> dict:
+        """Per-phase wall times and per-endpoint request statistics."""
+        with self._lock:
+            endpoints = {}
+            for endpoint, latencies in sorted(self.latencies.items()):
+                ordered = sorted(latencies)
+                endpoints[endpoint] = {
+                    "requests": len(ordered),
+                    "errors": self.errors.get(endpoint, 0),
+                    "bytes": self.bytes.get(endpoint, 0),
+                    "total_s": round(sum(ordered), 4),
+                    "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+                    "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+                    "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+                }
+            phases = {name: round(seconds, 4) for name, seconds in self.phases.items()}
+            phase_requests = dict(self.phase_requests)
+            phase_rss = {name: round(mb, 1) for name, mb in self.phase_rss.items()}
+        return {
+            "phases": phases,
+            "phase_requests": phase_requests,
+            "phase_peak_rss_mb": phase_rss,
+            "endpoints": endpoints,
+        }
+
+
+def print_metrics(summary: dict) -> None:
+    """Print phase wall times and endpoint latency percentiles."""
+    print("\nPhase timings:")
+    for name, seconds in summary["phases"].items():
+        requests = summary["phase_requests"].get(name, 0)
+        rss = summary["phase_peak_rss_mb"].get(name)
+        rss_text = f" {rss:>7.1f} MB peak" if rss is not None else ""
+        print(f"  {name:<10} {seconds:>8.2f}s {requests:>7} requests{rss_text}")
+    print("\nRequests:")
+    print(
+        f"  {'endpoint':<15} {'count':>7} {'errors':>6} {'bytes':>10} "
+        f"{'p50':>8} {'p95':>8} {'p99':>8}"
+    )
+    for endpoint, stats in summary["endpoints"].items():
+        print(
+            f"  {endpoint:<15} {stats['requests']:>7} {stats['errors']:>6} "
+            f"{format_size(stats['bytes']):>10} {stats['p50_ms']:>6.1f}ms "
+            f"{stats['p95_ms']:>6.1f}ms {stats['p99_ms']:>6.1f}ms"
+        )
+
+
+class AdaptiveLimiter:
+    """AIMD limit on the number of requests in flight.
+
+    The limit grows by about one slot per window of healthy responses and
+    halves when a request fails, at most once per window. A response is
+    healthy when its latency stays within LATENCY_TOLERANCE times the
+    fastest seen for its endpoint; slower responses hold the limit steady.
+    """
+
+    def __init__(self, max_limit: int, initial: int = INITIAL_CONCURRENCY) -> None:
+        self.max_limit = max(1, max_limit)
+        self.limit = float(min(self.max_limit, max(1, initial)))
+        self.decreases = 0
+        self._in_flight = 0
+        self._fastest: dict[str, float] = {}
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a request slot is free."""
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, endpoint: str, start: float, latency: float, ok: bool) -> None:
+        """Free a slot and adjust the limit from the request outcome."""
+        with self._cond:
+            self._in_flight -= 1
+            if not ok:
+                # Requests sent before the last cut saw the old limit
+                if start >= self._last_decrease:
+                    self.limit = max(1.0, self.limit / 2)
+                    self._last_decrease = time.monotonic()
+                    self.decreases += 1
+            else:
+                fastest = min(latency, self._fastest.get(endpoint, latency))
+                self._fastest[endpoint] = fastest
+                if latency <= fastest * LATENCY_TOLERANCE + LATENCY_SLACK:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class NavidromeClient:
+    """Keep-alive HTTP client shared by all Navidrome API calls.
+
+    Idle connections are pooled and handed out to whichever thread needs
+    one, so concurrent lookups reuse sockets (and TLS sessions) instead of
+    reconnecting. Gzip-encoded responses are decoded transparently. Every
+    request is recorded in metrics by endpoint, and the number of requests
+    in flight is capped by an AdaptiveLimiter.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        metrics: Metrics | None = None,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+    ) -> None:
+        parsed = urllib.parse.urlsplit(base_url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValueError(f"Unsupported server URL: {base_url}")
+        self.base_url = base_url
+        self.timeout = timeout
+        self._scheme = parsed.scheme
+        self._host = parsed.hostname
+        self._port = parsed.port
+        self._prefix = parsed.path.rstrip("/")
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.metrics = metrics or Metrics()
+        self.limiter = AdaptiveLimiter(max_concurrency)
+        self.retries = retries
+        self.retried = 0
+
+    def _acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        """Return an idle pooled connection, or a new one. Flags reuse."""
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop(), True
+            self.opened += 1
+        if self._scheme == "https":
+            conn = http.client.HTTPSConnection(
+                self._host, self._port, timeout=self.timeout
+            )
+        else:
+            conn = http.client.HTTPConnection(
+                self._host, self._port, timeout=self.timeout
+            )
+        return conn, False
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.append(conn)
+
+    def _send(
+        self, method: str, url: str, body: bytes | None, headers: dict[str, str]
+    ) -> tuple[int, str, bytes, str]:
+        """Send one request over a pooled connection.
+
+        Returns (status, reason, raw body, Content-Encoding).
+        """
+        while True:
+            conn, reused = self._acquire()
+            try:
+                conn.request(method, url, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                conn.close()
+                # Server dropped an idle keep-alive socket; retry on a fresh one
+                if reused:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            break
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+        encoding = response.getheader("Content-Encoding", "")
+        return response.status, response.reason, data, encoding
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> bytes:
+        """Send request over a pooled connection and return decoded body.
+
+        Connection errors, timeouts, 5xx and 429 responses are retried with
+        jittered exponential backoff, up to self.retries times.
+        """
+        all_headers = {"Accept-Encoding": "gzip", **(headers or {})}
+        url = f"{self._prefix}{path}"
+        endpoint = endpoint_name(path)
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            start = time.monotonic()
+            try:
+                status, reason, data, encoding = self._send(
+                    method, url, body, all_headers
+                )
+            except (OSError, http.client.HTTPException):
+                elapsed = time.monotonic() - start
+                self.limiter.release(endpoint, start, elapsed, ok=False)
+                self.metrics.record_request(endpoint, elapsed, 0, ok=False)
+                if attempt >= self.retries:
+                    raise
+            else:
+                elapsed = time.monotonic() - start
+                transient = status >= 500 or status == 429
+                self.limiter.release(endpoint, start, elapsed, ok=not transient)
+                self.metrics.record_request(
+                    endpoint, elapsed, len(data), ok=status < 400
+                )
+                if status < 400:
+                    if encoding.lower() == "gzip":
+                        data = gzip.decompress(data)
+                    return data
+                if not transient or attempt >= self.retries:
+                    raise RuntimeError(f"HTTP {status} {reason}: {method} {path}")
+
+            attempt += 1
+            with self._lock:
+                self.retried += 1
+            cap = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)
+            time.sleep(random.uniform(0, cap))
+
+    def close(self) -> None:
+        """Close all idle pooled connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def get_native_token(client: NavidromeClient, username: str, password: str) -> str:
     """Authenticate with Navidrome native API and return JWT token."""
-    url = f"{base_url}/auth/login"
     payload = json.dumps({"username": username, "password": password}).encode()
-    request = urllib.request.Request(
-        url,
-        data=payload,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-    with urllib.request.urlopen(request) as response:
-        data = json.loads(response.read())
+    data = json.loads(
+        client.request(
+            "POST",
+            "/auth/login",
+            body=payload,
+            headers={"Content-Type": "application/json"},
+        )
+    )
     return data["token"]
 
 
 def call_subsonic(
-    base_url: str,
+    client: NavidromeClient,
     endpoint: str,
     params: dict[str, str],
     extra: dict[str, str | int] | None = None,
@@ -68,10 +436,7 @@ def call_subsonic(
     if extra:
         merged.update({k: str(v) for k, v in extra.items()})
     query = urllib.parse.urlencode(merged)
-    url = f"{base_url}/rest/{endpoint}.view?{query}"
-    request = urllib.request.Request(url)
-    with urllib.request.urlopen(request) as response:
-        data = json.loads(response.read())
+    data = json.loads(client.request("GET", f"/rest/{endpoint}.view?{query}"))
 
     subsonic_response = data.get("subsonic-response", {})
     if subsonic_response.get("status") != "ok":
@@ -84,66 +449,314 @@ def call_subsonic(
 
 
 def call_native(
-    base_url: str,
+    client: NavidromeClient,
     endpoint: str,
     token: str,
     params: dict[str, str | int] | None = None,
 ) -> list | dict:
     """Call Navidrome native API endpoint and return parsed response."""
-    url = f"{base_url}/api/{endpoint}"
+    path = f"/api/{endpoint}"
     if params:
         query = urllib.parse.urlencode({k: str(v) for k, v in params.items()})
-        url = f"{url}?{query}"
-    request = urllib.request.Request(
-        url,
-        headers={"x-nd-authorization": f"Bearer {token}"},
+        path = f"{path}?{query}"
+    return json.loads(
+        client.request(
+            "GET",
+            path,
+            headers={"x-nd-authorization": f"Bearer {token}"},
+        )
     )
-    with urllib.request.urlopen(request) as response:
-        return json.loads(response.read())
 
 
-def fetch_all_albums(base_url: str, params: dict[str, str]) -> list[dict]:
-    """Paginate getAlbumList2 and return all albums."""
-    albums = []
-    offset = 0
-    while True:
+@dataclass(slots=True)
+class Album:
+    """Compact album record keeping only the fields the tool uses."""
+
+    id: str
+    artist: str
+    name: str
+    rating: int
+    song_count: int
+
+    @classmethod
+    def from_subsonic(cls, data: dict) -> "Album":
+        """Build from a getAlbumList2 entry, dropping every other field."""
+        return cls(
+            id=data.get("id", ""),
+            artist=sys.intern(data.get("artist", "Unknown")),
+            name=data.get("name", "Unknown"),
+            rating=data.get("userRating", 0),
+            song_count=data.get("songCount", 0),
+        )
+
+
+def next_page_size(size: int, elapsed: float, limit: int) -> int:
+    """Scale page size toward TARGET_PAGE_SECONDS, at most 2x per step."""
+    factor = min(2.0, max(0.5, TARGET_PAGE_SECONDS / max(elapsed, 1e-3)))
+    scaled = round(size * factor / MIN_PAGE_SIZE) * MIN_PAGE_SIZE
+    return max(MIN_PAGE_SIZE, min(limit, scaled))
+
+
+def iter_album_pages(
+    client: NavidromeClient,
+    params: dict[str, str],
+    list_type: str = "alphabeticalByName",
+) -> Iterator[list[Album]]:
+    """Paginate getAlbumList2 of the given type, yielding one page at a time.
+
+    The next page is requested in the background while the caller is still
+    processing the current one. Page size adapts to the observed response
+    time. Servers may cap the page size (Navidrome allows 500), so a short
+    page only ends the listing once the cap is known.
+    """
+
+    def fetch_page(offset: int, size: int) -> tuple[list[Album], float]:
+        start = time.monotonic()
         response = call_subsonic(
-            base_url,
+            client,
             "getAlbumList2",
             params,
             extra={
-                "type": "alphabeticalByName",
-                "size": PAGE_SIZE,
+                "type": list_type,
+                "size": size,
                 "offset": offset,
             },
         )
-        album_list = response.get("albumList2", {})
-        batch = album_list.get("album", [])
-        if not batch:
-            break
-        albums.extend(batch)
-        if len(batch) < PAGE_SIZE:
+        entries = response.get("albumList2", {}).get("album", [])
+        batch = [Album.from_subsonic(entry) for entry in entries]
+        return batch, time.monotonic() - start
+
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        offset = 0
+        size = PAGE_SIZE
+        size_limit = MAX_PAGE_SIZE
+        pending = prefetcher.submit(fetch_page, offset, size)
+        while True:
+            wait_start = time.monotonic()
+            batch, elapsed = pending.result()
+            client.metrics.add_phase("fetch", time.monotonic() - wait_start)
+            if not batch:
+                break
+            more = len(batch) >= size
+            if not more and size > PAGE_SIZE and size_limit > len(batch):
+                # Short page above the usual limit: assume a server cap
+                size_limit = max(PAGE_SIZE, len(batch))
+                more = True
+            if more:
+                offset += len(batch)
+                size = next_page_size(size, elapsed, size_limit)
+                pending = prefetcher.submit(fetch_page, offset, size)
+            yield batch
+            if not more:
+                break
+
+
+def iter_albums(
+    client: NavidromeClient,
+    params: dict[str, str],
+    list_type: str = "alphabeticalByName",
+) -> Iterator[Album]:
+    """Stream albums from getAlbumList2 as pages arrive."""
+    for batch in iter_album_pages(client, params, list_type):
+        yield from batch
+
+
+@dataclass
+class LibraryTotals:
+    """Running totals over the full album listing."""
+
+    albums: int = 0
+    songs: int = 0
+
+
+def count_albums(albums: Iterable[Album], totals: LibraryTotals) -> Iterator[Album]:
+    """Pass albums through while adding them to totals."""
+    for album in albums:
+        totals.albums += 1
+        totals.songs += album.song_count
+        yield album
+
+
+class AlbumCatalog:
+    """On-disk SQLite cache of album IDs, ratings and resolved paths.
+
+    A full refresh stores the whole getAlbumList2 listing; later runs only
+    pull new albums and the current set of rated albums (see sync_catalog).
+    Albums removed on the server by other means linger until the next full
+    refresh and show up as missing paths in the plan.
+    """
+
+    def __init__(self, path: Path, server: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.server = server
+        self._db = sqlite3.connect(path)
+        self._db.executescript(CATALOG_SCHEMA)
+
+    def _get_meta(self, key: str) -> str | None:
+        row = self._db.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def needs_full_refresh(self, max_age_days: float) -> bool:
+        """True if the catalog is empty, stale or belongs to another server/user."""
+        if self._get_meta("server") != self.server:
+            return True
+        synced_at = self._get_meta("full_sync_at")
+        if synced_at is None:
+            return True
+        return time.time() - float(synced_at) > max_age_days * 86400
+
+    def replace_all(self, albums: Iterable[Album]) -> None:
+        """Replace the catalog with a streamed full listing, keeping known paths."""
+        known_dirs = dict(
+            self._db.execute(
+                "SELECT id, relative_dir FROM albums WHERE relative_dir IS NOT NULL"
+            )
+        )
+        with self._db:
+            self._db.execute("DELETE FROM albums")
+            self._db.executemany(
+                "INSERT OR IGNORE INTO albums VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        album.id,
+                        position,
+                        album.artist,
+                        album.name,
+                        album.rating,
+                        album.song_count,
+                        known_dirs.get(album.id),
+                    )
+                    for position, album in enumerate(albums)
+                ),
+            )
+            self._set_meta("server", self.server)
+            self._set_meta("full_sync_at", str(time.time()))
+
+    def known_ids(self) -> set[str]:
+        return {row[0] for row in self._db.execute("SELECT id FROM albums")}
+
+    def add_albums(self, albums: list[Album]) -> None:
+        """Append albums not yet in the catalog."""
+        (last,) = self._db.execute("SELECT COALESCE(MAX(position), -1) FROM albums")
+        with self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO albums VALUES (?, ?, ?, ?, ?, ?, NULL)",
+                (
+                    (
+                        album.id,
+                        last[0] + 1 + offset,
+                        album.artist,
+                        album.name,
+                        album.rating,
+                        album.song_count,
+                    )
+                    for offset, album in enumerate(albums)
+                ),
+            )
+
+    def set_ratings(self, rated: list[Album]) -> None:
+        """Make rated albums the only ones with a non-zero rating."""
+        with self._db:
+            self._db.execute("UPDATE albums SET rating = 0 WHERE rating != 0")
+            self._db.executemany(
+                "UPDATE albums SET rating = ? WHERE id = ?",
+                ((album.rating, album.id) for album in rated),
+            )
+
+    def albums(self) -> Iterator[Album]:
+        """Stream cached albums in listing order."""
+        rows = self._db.execute(
+            "SELECT id, artist, name, rating, song_count FROM albums ORDER BY position"
+        )
+        for row in rows:
+            yield Album(*row)
+
+    def album_dirs(self) -> dict[str, str]:
+        """Return cached album_id -> relative_dir paths."""
+        return dict(
+            self._db.execute(
+                "SELECT id, relative_dir FROM albums WHERE relative_dir IS NOT NULL"
+            )
+        )
+
+    def store_dirs(self, dirs: dict[str, str]) -> None:
+        with self._db:
+            self._db.executemany(
+                "UPDATE albums SET relative_dir = ? WHERE id = ?",
+                ((relative_dir, album_id) for album_id, relative_dir in dirs.items()),
+            )
+
+    def remove(self, album_ids: list[str]) -> None:
+        with self._db:
+            self._db.executemany(
+                "DELETE FROM albums WHERE id = ?",
+                ((album_id,) for album_id in album_ids),
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def sync_catalog(
+    client: NavidromeClient,
+    params: dict[str, str],
+    catalog: AlbumCatalog,
+    max_age_days: float = CATALOG_MAX_AGE_DAYS,
+    force_full: bool = False,
+) -> tuple[Iterator[Album], str]:
+    """Bring the catalog up to date and return (album stream, sync summary).
+
+    A delta sync pages the newest albums until it reaches one already
+    cached, then reloads the rated albums (type=highest) to pick up rating
+    changes. Anything else triggers a full getAlbumList2 refresh.
+    """
+    if force_full or catalog.needs_full_refresh(max_age_days):
+        catalog.replace_all(iter_albums(client, params))
+        return catalog.albums(), "full refresh"
+
+    known = catalog.known_ids()
+    new_albums = []
+    for batch in iter_album_pages(client, params, "newest"):
+        fresh = [album for album in batch if album.id not in known]
+        new_albums.extend(fresh)
+        if len(fresh) < len(batch):
             break
-        offset += PAGE_SIZE
-    return albums
+
+    rated = [
+        album
+        for batch in iter_album_pages(client, params, "highest")
+        for album in batch
+        if album.rating > 0
+    ]
+    catalog.add_albums(new_albums + rated)
+    catalog.set_ratings(rated)
+    return catalog.albums(), f"delta sync, {len(new_albums)} new, {len(rated)} rated"
 
 
 def filter_by_rating(
-    albums: list[dict], min_rating: int, max_rating: int
-) -> list[dict]:
+    albums: Iterable[Album], min_rating: int, max_rating: int
+) -> list[Album]:
     """Keep albums where userRating is between min and max inclusive."""
     result = []
     for album in albums:
-        rating = album.get("userRating", 0)
+        rating = album.rating
         if rating > 0 and min_rating <= rating <= max_rating:
             result.append(album)
     return result
 
 
-def get_album_dir(base_url: str, token: str, album_id: str) -> str | None:
+def get_album_dir(client: NavidromeClient, token: str, album_id: str) -> str | None:
     """Resolve full relative directory path via native API song lookup."""
     songs = call_native(
-        base_url,
+        client,
         "song",
         token,
         params={
@@ -163,26 +776,266 @@ def get_album_dir(base_url: str, token: str, album_id: str) -> str | None:
     return str(Path(song_path).parent)
 
 
-def build_plan(
-    albums: list[dict],
-    base_url: str,
+def build_album_dir_index(
+    client: NavidromeClient,
+    token: str,
+    album_ids: set[str] | None = None,
+    expected_songs: int = 0,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> dict[str, str]:
+    """Page through all songs once and map album IDs to relative directories.
+
+    Songs are listed sorted by album in SONG_WINDOW-sized windows. The windows
+    covering expected_songs are fetched concurrently; paging continues past
+    them if the library turns out to be larger. For each album the song with
+    the lowest title wins, matching get_album_dir. Pass album_ids to index
+    only those albums.
+    """
+    first_song: dict[str, tuple[str, str]] = {}
+
+    def fetch_window(start: int) -> list[dict]:
+        return call_native(
+            client,
+            "song",
+            token,
+            params={
+                "_start": start,
+                "_end": start + SONG_WINDOW,
+                "_order": "ASC",
+                "_sort": "album",
+            },
+        )
+
+    def add_songs(songs: list[dict]) -> None:
+        for song in songs:
+            album_id = song.get("albumId", "")
+            song_path = song.get("path", "")
+            if not album_id or not song_path:
+                continue
+            if album_ids is not None and album_id not in album_ids:
+                continue
+            key = (song.get("title", ""), song_path)
+            if album_id not in first_song or key < first_song[album_id]:
+                first_song[album_id] = key
+
+    windows = max(1, math.ceil(expected_songs / SONG_WINDOW))
+    starts = [i * SONG_WINDOW for i in range(windows)]
+    # Fold each window into the index as it arrives instead of holding them all
+    songs: list[dict] = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for songs in executor.map(fetch_window, starts):
+            add_songs(songs)
+
+    start = starts[-1]
+    while len(songs) >= SONG_WINDOW:
+        start += SONG_WINDOW
+        songs = fetch_window(start)
+        add_songs(songs)
+
+    return {
+        album_id: str(Path(song_path).parent)
+        for album_id, (_, song_path) in first_song.items()
+    }
+
+
+def choose_resolve_mode(mode: str, matched: list[Album], total_songs: int) -> str:
+    """Pick per-album lookups or a bulk song scan for resolving paths.
+
+    In auto mode the bulk scan wins once the matched albums would need more
+    requests than paging through every song in the library.
+    """
+    if mode != "auto":
+        return mode
+    windows = max(1, math.ceil(total_songs / SONG_WINDOW))
+    return "bulk" if len(matched) > windows * BULK_WINDOW_COST else "album"
+
+
+def resolve_album_dirs(
+    client: NavidromeClient,
     native_token: str,
+    albums: list[Album],
+    total_songs: int,
+    mode: str = "auto",
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> dict[str, str]:
+    """Resolve album_id -> relative_dir for albums, per album or in bulk."""
+    album_ids = [album.id for album in albums]
+    if choose_resolve_mode(mode, albums, total_songs) == "bulk":
+        print("Resolving paths (bulk song scan)...")
+        return build_album_dir_index(
+            client,
+            native_token,
+            album_ids=set(album_ids),
+            expected_songs=total_songs,
+            concurrency=concurrency,
+        )
+
+    print("Resolving paths (per-album lookups)...")
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        relative_dirs = executor.map(
+            lambda album_id: get_album_dir(client, native_token, album_id),
+            album_ids,
+        )
+        return {
+            album_id: relative_dir
+            for album_id, relative_dir in zip(album_ids, relative_dirs, strict=True)
+            if relative_dir
+        }
+
+
+def tree_size(path: str) -> int:
+    """Total size in bytes of all files below path, without following symlinks."""
+    total = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                total += tree_size(entry.path)
+            else:
+                total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+
+def scan_album_dirs(
+    path: str, relative: str, depth: int, unreadable: list[str]
+) -> list[str]:
+    """List album directories depth levels below path.
+
+    Directories that cannot be listed are warned about and their relative
+    paths appended to unreadable instead of aborting the scan.
+    """
+    try:
+        with os.scandir(path) as entries:
+            subdirs = sorted(
+                (entry.name, entry.path)
+                for entry in entries
+                if entry.is_dir(follow_symlinks=False)
+                and not entry.name.startswith(".")
+            )
+    except OSError as e:
+        print(f"  Warning: cannot list {path}: {e}")
+        unreadable.append(relative)
+        return []
+    index = []
+    for name, sub_path in subdirs:
+        sub_relative = f"{relative}/{name}" if relative else name
+        if depth == 1:
+            index.append(sub_relative)
+        else:
+            index.extend(scan_album_dirs(sub_path, sub_relative, depth - 1, unreadable))
+    return index
+
+
+def scan_music_root(
+    music_root: Path, workers: int = DEFAULT_SCAN_WORKERS
+) -> tuple[set[str], list[str]]:
+    """Index album directories under music_root as relative_dir paths.
+
+    Each top-level (genre) directory is listed by its own worker with
+    os.scandir, so the tree down to album level is read in a single pass.
+    Files are not stat'ed; see size_album_dirs. Returns the album paths and
+    the relative paths of directories that could not be listed.
+    """
+    unreadable: list[str] = []
+    genres = scan_album_dirs(str(music_root), "", 1, unreadable)
+    index = set()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for genre_index in executor.map(
+            lambda genre: scan_album_dirs(
+                str(music_root / genre), genre, ALBUM_DEPTH - 1, unreadable
+            ),
+            genres,
+        ):
+            index.update(genre_index)
+    return index, sorted(unreadable)
+
+
+def size_album_dirs(
+    music_root: Path, relative_dirs: Iterable[str], workers: int = DEFAULT_SCAN_WORKERS
+) -> dict[str, int | None]:
+    """Measure the given album directories in parallel.
+
+    Only the albums that are reported get walked, rather than the whole
+    library. A directory that cannot be read is warned about and sized None.
+    """
+
+    def measure(relative_dir: str) -> int | None:
+        try:
+            return tree_size(str(music_root / relative_dir))
+        except OSError as e:
+            print(f"  Warning: cannot size {music_root / relative_dir}: {e}")
+            return None
+
+    relative_dirs = list(relative_dirs)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return dict(
+            zip(relative_dirs, executor.map(measure, relative_dirs), strict=True)
+        )
+
+
+def find_orphans(fs_index: set[str], known_dirs: Iterable[str]) -> list[str]:
+    """Return indexed album directories that no Navidrome album points to."""
+    known = {
+        "/".join(Path(relative_dir).parts[:ALBUM_DEPTH]) for relative_dir in known_dirs
+    }
+    return sorted(
+        relative_dir for relative_dir in fs_index if relative_dir not in known
+    )
+
+
+def print_orphans(
+    orphans: list[str], sizes: dict[str, int | None], music_root: Path
+) -> None:
+    """Print album directories on disk that Navidrome does not know about."""
+    if not orphans:
+        print("No orphan directories found.")
+        return
+    total = sum(sizes[relative_dir] or 0 for relative_dir in orphans)
+    print(f"\nOrphan directories ({len(orphans)}, {format_size(total)}):")
+    for relative_dir in orphans:
+        size = sizes[relative_dir]
+        status = f" ({format_size(size)})" if size is not None else ""
+        print(f"  {music_root / relative_dir}{status}")
+
+
+def build_plan(
+    albums: list[Album],
+    dir_index: dict[str, str],
     music_root: Path,
+    fs_index: set[str] | None = None,
+    unreadable: Iterable[str] = (),
 ) -> list[dict]:
-    """Build deletion plan with resolved paths for each album."""
+    """Build deletion plan with resolved paths for each album.
+
+    dir_index maps album IDs to relative directories (see
+    resolve_album_dirs). With fs_index (see scan_music_root) existence
+    comes from the in-memory scan instead of a stat per album, except under
+    the scan's unreadable directories. Sizes are left None for
+    size_album_dirs to fill in. The plan and warnings keep the order of the
+    input albums.
+    """
+    # An unreadable music root ("") leaves every album unscanned
+    unscanned = tuple(f"{relative}/" if relative else "" for relative in unreadable)
     plan = []
     for album in albums:
-        album_id = album.get("id", "")
-        artist = album.get("artist", "Unknown")
-        name = album.get("name", "Unknown")
-        rating = album.get("userRating", 0)
+        album_id = album.id
+        artist = album.artist
+        name = album.name
+        rating = album.rating
 
-        relative_dir = get_album_dir(base_url, native_token, album_id)
+        relative_dir = dir_index.get(album_id)
         if not relative_dir:
             print(f"  Warning: no songs found for '{artist} - {name}', skipping")
             continue
 
         full_path = music_root / relative_dir
+        if (
+            fs_index is not None
+            and len(Path(relative_dir).parts) == ALBUM_DEPTH
+            and not relative_dir.startswith(unscanned)
+        ):
+            exists = relative_dir in fs_index
+        else:
+            exists = full_path.exists()
         plan.append(
             {
                 "id": album_id,
@@ -191,7 +1044,8 @@ def build_plan(
                 "rating": rating,
                 "relative_dir": relative_dir,
                 "full_path": full_path,
-                "exists": full_path.exists(),
+                "exists": exists,
+                "size": None,
             }
         )
     return plan
@@ -204,12 +1058,19 @@ def print_plan(plan: list[dict], dry_run: bool) -> None:
         return
 
     mode = "DRY RUN" if dry_run else "EXECUTE"
+    sizes = [entry["size"] for entry in plan if entry["size"] is not None]
+    reclaimable = f" | Reclaimable: {format_size(sum(sizes))}" if sizes else ""
     print(f"\n{'=' * 70}")
-    print(f"  Mode: {mode} | Albums: {len(plan)}")
+    print(f"  Mode: {mode} | Albums: {len(plan)}{reclaimable}")
     print(f"{'=' * 70}\n")
 
     for entry in plan:
-        status = "" if entry["exists"] else " [NOT FOUND]"
+        if not entry["exists"]:
+            status = " [NOT FOUND]"
+        elif entry["size"] is not None:
+            status = f" ({format_size(entry['size'])})"
+        else:
+            status = ""
         print(f"  Rating: {entry['rating']}/5")
         print(f"  Artist: {entry['artist']}")
         print(f"  Album:  {entry['name']}")
@@ -221,8 +1082,108 @@ def print_plan(plan: list[dict], dry_run: bool) -> None:
         print("Dry run complete. Use --execute to delete these directories.")
 
 
-def execute_deletions(plan: list[dict]) -> tuple[int, int]:
-    """Delete album directories from disk. Returns (success, failure) counts."""
+def remove_tree(path: Path) -> tuple[int, int]:
+    """Delete a directory tree like shutil.rmtree, returning (files, bytes).
+
+    Symlinks inside the tree are removed, never followed. Like rmtree, a
+    path that is itself a symlink is refused before anything is deleted,
+    so the link's target is never emptied.
+    """
+    if os.path.islink(path):
+        raise OSError(errno.ELOOP, "Refusing to delete through a symlink", str(path))
+    file_count = 0
+    byte_count = 0
+    with os.scandir(path) as entries:
+        children = list(entries)
+    for entry in children:
+        if entry.is_dir(follow_symlinks=False):
+            sub_files, sub_bytes = remove_tree(Path(entry.path))
+            file_count += sub_files
+            byte_count += sub_bytes
+        else:
+            byte_count += entry.stat(follow_symlinks=False).st_size
+            os.unlink(entry.path)
+            file_count += 1
+    os.rmdir(path)
+    return file_count, byte_count
+
+
+def delete_album(path: Path) -> tuple[int, int, OSError | None]:
+    """Delete one album directory. Returns (files, bytes, error)."""
+    try:
+        file_count, byte_count = remove_tree(path)
+    except OSError as exc:
+        return 0, 0, exc
+    return file_count, byte_count, None
+
+
+def format_size(byte_count: float) -> str:
+    """Format a byte count as a human-readable size."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if byte_count < 1024:
+            return f"{byte_count:.1f} {unit}"
+        byte_count /= 1024
+    return f"{byte_count:.1f} TB"
+
+
+def execute_deletions(
+    plan: list[dict], workers: int = DEFAULT_DELETE_WORKERS
+) -> tuple[int, int]:
+    """Delete album directories from disk. Returns (success, failure) counts.
+
+    Albums are deleted by a pool of workers, which overlaps the per-file
+    round trips of network mounts. Results are reported in plan order.
+    """
+    ok_count = 0
+    fail_count = 0
+    total_files = 0
+    total_bytes = 0
+    targets = [entry["full_path"] for entry in plan if entry["exists"]]
+    for entry in plan:
+        if not entry["exists"]:
+            print(f"  Skip (not found): {entry['full_path']}")
+            fail_count += 1
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = executor.map(delete_album, targets)
+        for done, (path, (file_count, byte_count, error)) in enumerate(
+            zip(targets, results, strict=True), start=1
+        ):
+            progress = f"[{done}/{len(targets)}]"
+            if isinstance(error, PermissionError):
+                print(f"  {progress} Error (permission denied): {path} — {error}")
+                fail_count += 1
+            elif error is not None:
+                print(f"  {progress} Error: {path} — {error}")
+                fail_count += 1
+            else:
+                print(
+                    f"  {progress} Deleted: {path} "
+                    f"({file_count} files, {format_size(byte_count)})"
+                )
+                ok_count += 1
+                total_files += file_count
+                total_bytes += byte_count
+    elapsed = time.monotonic() - start
+
+    if targets:
+        rate = elapsed or float("inf")
+        print(
+            f"\nRemoved {total_files} files, {format_size(total_bytes)} "
+            f"in {elapsed:.1f}s ({total_bytes / rate / 1024**2:.1f} MB/s, "
+            f"{ok_count / rate:.1f} albums/s)"
+        )
+    return ok_count, fail_count
+
+
+def quarantine_albums(plan: list[dict], quarantine_dir: Path) -> tuple[int, int]:
+    """Move album directories into quarantine_dir. Returns (success, failure).
+
+    Albums keep their path relative to the music root, so a batch can be
+    restored by moving it back. Moves are plain renames, which only works
+    when the quarantine is on the same filesystem as the music root.
+    """
     ok_count = 0
     fail_count = 0
     for entry in plan:
@@ -231,23 +1192,289 @@ def execute_deletions(plan: list[dict]) -> tuple[int, int]:
             print(f"  Skip (not found): {path}")
             fail_count += 1
             continue
+        target = quarantine_dir / entry["relative_dir"]
         try:
-            shutil.rmtree(path)
-            print(f"  Deleted: {path}")
-            ok_count += 1
-        except PermissionError as exc:
-            print(f"  Error (permission denied): {path} — {exc}")
-            fail_count += 1
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.rename(path, target)
         except OSError as exc:
-            print(f"  Error: {path} — {exc}")
+            if exc.errno == errno.EXDEV:
+                print(f"  Error (different filesystem): {path} — {exc}")
+            else:
+                print(f"  Error: {path} — {exc}")
             fail_count += 1
+            continue
+        size = f" ({format_size(entry['size'])})" if entry["size"] is not None else ""
+        print(f"  Quarantined: {path} → {target}{size}")
+        ok_count += 1
     return ok_count, fail_count
 
 
-def trigger_rescan(base_url: str, params: dict[str, str]) -> None:
-    """Trigger Navidrome library rescan via Subsonic API."""
-    call_subsonic(base_url, "startScan", params)
-    print("Library rescan triggered.")
+def purge_quarantine(
+    quarantine_root: Path, max_age_days: float, keep_batch: str, dry_run: bool
+) -> list[tuple[Path, int, int, OSError | None]]:
+    """Delete quarantine batches older than max_age_days.
+
+    Batches are the timestamp-named directories created by
+    quarantine_albums; keep_batch (the current run) is never purged. In a
+    dry run nothing is deleted and only batch sizes are reported. Returns
+    (batch, files, bytes, error) per batch.
+    """
+    if not quarantine_root.is_dir():
+        return []
+    cutoff = time.time() - max_age_days * 86400
+    results = []
+    for batch in sorted(os.listdir(quarantine_root)):
+        if batch == keep_batch:
+            continue
+        try:
+            created = time.mktime(time.strptime(batch, QUARANTINE_BATCH_FORMAT))
+        except ValueError:
+            continue
+        if created >= cutoff:
+            continue
+        path = quarantine_root / batch
+        if dry_run:
+            try:
+                results.append((path, 0, tree_size(str(path)), None))
+            except OSError as e:
+                results.append((path, 0, 0, e))
+        else:
+            results.append((path, *delete_album(path)))
+    return results
+
+
+def print_purge(
+    results: list[tuple[Path, int, int, OSError | None]], dry_run: bool
+) -> None:
+    """Print the outcome of purge_quarantine."""
+    if not results:
+        print("\nNo quarantine batches to purge.")
+        return
+    print("\nQuarantine purge:")
+    for path, file_count, byte_count, error in results:
+        if error is not None:
+            print(f"  Error: {path} — {error}")
+        elif dry_run:
+            print(f"  Would purge: {path} ({format_size(byte_count)})")
+        else:
+            print(f"  Purged: {path} ({file_count} files, {format_size(byte_count)})")
+
+
+def choose_scan_mode(mode: str, removed: int, threshold: int) -> bool:
+    """Return True for a full rescan, False for a quick one.
+
+    In auto mode a full scan is used once more than threshold album
+    directories were removed.
+    """
+    if mode != "auto":
+        return mode == "full"
+    return removed > threshold
+
+
+def trigger_rescan(
+    client: NavidromeClient, params: dict[str, str], full: bool = False
+) -> dict:
+    """Trigger Navidrome library rescan via Subsonic API.
+
+    Returns the scanStatus reported by startScan.
+    """
+    extra = {"fullScan": "true"} if full else None
+    response = call_subsonic(client, "startScan", params, extra=extra)
+    print(f"Library {'full' if full else 'quick'} rescan triggered.")
+    return response.get("scanStatus", {})
+
+
+def wait_for_scan(
+    client: NavidromeClient,
+    params: dict[str, str],
+    timeout: float = DEFAULT_SCAN_TIMEOUT,
+) -> dict | None:
+    """Poll getScanStatus with backoff until the scan finishes.
+
+    Returns the final scanStatus, or None if timeout expires first.
+    """
+    start = time.monotonic()
+    delay = SCAN_POLL_INITIAL
+    while True:
+        remaining = timeout - (time.monotonic() - start)
+        if remaining <= 0:
+            return None
+        time.sleep(min(delay, remaining))
+        delay = min(SCAN_POLL_MAX, delay * 1.5)
+        status = call_subsonic(client, "getScanStatus", params).get("scanStatus", {})
+        if not status.get("scanning", False):
+            return status
+
+
+def print_scan_result(status: dict | None, elapsed: float, timeout: float) -> None:
+    """Report how long the rescan took and what it counted."""
+    if status is None:
+        print(f"Scan still running after {timeout:g}s; stopped waiting.")
+        return
+    details = [f"{status.get('count', 0)} items"]
+    if "folderCount" in status:
+        details.append(f"{status['folderCount']} folders")
+    print(f"Scan finished in {elapsed:.1f}s ({', '.join(details)})")
+
+
+def run_cleanup(
+    client: NavidromeClient,
+    catalog: AlbumCatalog | None,
+    args: argparse.Namespace,
+    username: str,
+    password: str,
+    quarantine_dir: Path | None = None,
+) -> None:
+    """Fetch albums, filter by rating, then delete, quarantine or dry-run."""
+    dry_run = not args.execute
+    music_root = args.music_root
+    metrics = client.metrics
+
+    print(f"Server:     {client.base_url}")
+    print(f"Music root: {music_root}")
+    print(f"Filter:     rating {args.min_rating}-{args.max_rating}")
+    print(f"Mode:       {'DRY RUN' if dry_run else 'EXECUTE'}")
+    if catalog is not None:
+        print(f"Catalog:    {catalog.path}")
+
+    # Authenticate
+    with metrics.phase("auth"):
+        subsonic_params = generate_subsonic_params(username, password)
+        native_token = get_native_token(client, username, password)
+
+    # Fetch and filter albums as pages arrive. Time spent waiting for pages
+    # counts as fetch, the rest of the pipeline as filter.
+    print("\nFetching albums...")
+    start = time.monotonic()
+    sync_summary = ""
+    with metrics.tagged("fetch"):
+        if catalog is not None:
+            albums, sync_summary = sync_catalog(
+                client,
+                subsonic_params,
+                catalog,
+                max_age_days=args.catalog_max_age,
+                force_full=args.refresh_catalog,
+            )
+        else:
+            albums = iter_albums(client, subsonic_params)
+        totals = LibraryTotals()
+        matched = filter_by_rating(
+            count_albums(albums, totals), args.min_rating, args.max_rating
+        )
+    elapsed = time.monotonic() - start
+    metrics.add_phase("filter", max(0.0, elapsed - metrics.phases.get("fetch", 0.0)))
+    if sync_summary:
+        print(f"Found {totals.albums} albums ({elapsed:.1f}s, {sync_summary})")
+    else:
+        print(f"Found {totals.albums} albums ({elapsed:.1f}s)")
+    print(
+        f"Matched {len(matched)} albums with rating {args.min_rating}-{args.max_rating}"
+    )
+
+    # Index the music root in one pass instead of a stat per album
+    fs_index = None
+    unreadable = []
+    if args.scan_root or args.list_orphans:
+        print("Scanning music root...")
+        start = time.monotonic()
+        with metrics.phase("scan"):
+            fs_index, unreadable = scan_music_root(music_root, args.scan_workers)
+        elapsed = time.monotonic() - start
+        print(f"Indexed {len(fs_index)} album directories ({elapsed:.1f}s)")
+
+    # Resolve full paths via native API. Dry runs reuse cached paths;
+    # deletions always act on freshly resolved ones.
+    dir_index = {}
+    if catalog is not None and dry_run:
+        dir_index = catalog.album_dirs()
+    fully_indexed = False
+
+    if fs_index is not None and args.list_orphans:
+        print("Indexing all album paths (bulk song scan)...")
+        with metrics.phase("plan"):
+            known_dirs = build_album_dir_index(
+                client,
+                native_token,
+                expected_songs=totals.songs,
+                concurrency=args.concurrency,
+            )
+        dir_index.update(known_dirs)
+        fully_indexed = True
+        if catalog is not None:
+            catalog.store_dirs(known_dirs)
+        orphans = find_orphans(fs_index, known_dirs.values())
+        with metrics.phase("scan"):
+            orphan_sizes = size_album_dirs(music_root, orphans, args.scan_workers)
+        print_orphans(orphans, orphan_sizes, music_root)
+
+    if not matched:
+        print("Nothing to do.")
+        return
+
+    with metrics.phase("plan"):
+        pending = [album for album in matched if album.id not in dir_index]
+        if pending and not fully_indexed:
+            resolved = resolve_album_dirs(
+                client,
+                native_token,
+                pending,
+                totals.songs,
+                mode=args.resolve,
+                concurrency=args.concurrency,
+            )
+            dir_index.update(resolved)
+            if catalog is not None:
+                catalog.store_dirs(resolved)
+        elif not fully_indexed:
+            print("Resolving paths (cached)...")
+        plan = build_plan(matched, dir_index, music_root, fs_index, unreadable)
+    if fs_index is not None:
+        # Walk only the albums in the plan, not the whole library
+        with metrics.phase("scan"):
+            sizes = size_album_dirs(
+                music_root,
+                [entry["relative_dir"] for entry in plan if entry["exists"]],
+                args.scan_workers,
+            )
+        for entry in plan:
+            entry["size"] = sizes.get(entry["relative_dir"])
+    print_plan(plan, dry_run)
+
+    if not dry_run and plan:
+        if quarantine_dir is not None:
+            print(f"\nMoving directories to {quarantine_dir}...")
+            with metrics.phase("delete"):
+                ok_count, fail_count = quarantine_albums(plan, quarantine_dir)
+            print(f"\nDone: {ok_count} quarantined, {fail_count} failed/skipped")
+        else:
+            print("\nDeleting directories...")
+            with metrics.phase("delete"):
+                ok_count, fail_count = execute_deletions(plan, args.delete_workers)
+            print(f"\nDone: {ok_count} deleted, {fail_count} failed/skipped")
+        if catalog is not None:
+            catalog.remove(
+                [
+                    entry["id"]
+                    for entry in plan
+                    if entry["exists"] and not entry["full_path"].exists()
+                ]
+            )
+
+        if ok_count > 0:
+            full_scan = choose_scan_mode(
+                args.scan_mode, ok_count, args.full_scan_threshold
+            )
+            print("\nTriggering library rescan...")
+            with metrics.phase("rescan"):
+                start = time.monotonic()
+                trigger_rescan(client, subsonic_params, full_scan)
+                if args.wait_scan:
+                    print("Waiting for scan to finish...")
+                    status = wait_for_scan(client, subsonic_params, args.scan_timeout)
+                    print_scan_result(
+                        status, time.monotonic() - start, args.scan_timeout
+                    )
 
 
 def main() -> None:
@@ -283,6 +1510,130 @@ def main() -> None:
         default=2,
         help="Maximum rating to delete, inclusive (default: 2)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Maximum parallel API requests; the actual level adapts to server "
+        f"health (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--delete-workers",
+        type=int,
+        default=DEFAULT_DELETE_WORKERS,
+        help=f"Parallel album deletions (default: {DEFAULT_DELETE_WORKERS})",
+    )
+    parser.add_argument(
+        "--scan-root",
+        action="store_true",
+        help="Pre-scan the music root to check existence in one pass and "
+        "report the size of each planned album",
+    )
+    parser.add_argument(
+        "--list-orphans",
+        action="store_true",
+        help="List album directories Navidrome does not know about "
+        "(implies --scan-root and a bulk song scan)",
+    )
+    parser.add_argument(
+        "--scan-workers",
+        type=int,
+        default=DEFAULT_SCAN_WORKERS,
+        help=f"Parallel genre directory scans (default: {DEFAULT_SCAN_WORKERS})",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"Retries per request on errors and timeouts (default: {DEFAULT_RETRIES})",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"HTTP connect/read timeout in seconds (default: {DEFAULT_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--resolve",
+        choices=RESOLVE_MODES,
+        default="auto",
+        help="Path resolution: per-album lookups, one bulk song scan, "
+        "or pick automatically (default: auto)",
+    )
+    parser.add_argument(
+        "--catalog",
+        type=Path,
+        default=DEFAULT_CATALOG,
+        help=f"Local album catalog cache (default: {DEFAULT_CATALOG})",
+    )
+    parser.add_argument(
+        "--no-catalog",
+        action="store_true",
+        help="Fetch everything from the server without using the catalog",
+    )
+    parser.add_argument(
+        "--refresh-catalog",
+        action="store_true",
+        help="Force a full catalog refresh instead of a delta sync",
+    )
+    parser.add_argument(
+        "--catalog-max-age",
+        type=float,
+        default=CATALOG_MAX_AGE_DAYS,
+        help="Days before the catalog is fully refreshed "
+        f"(default: {CATALOG_MAX_AGE_DAYS:g})",
+    )
+    parser.add_argument(
+        "--quarantine",
+        type=Path,
+        metavar="DIR",
+        help="Move albums into a timestamped batch under DIR instead of "
+        "deleting them (must be on the same filesystem as the music root, "
+        "but outside it)",
+    )
+    parser.add_argument(
+        "--purge-days",
+        type=float,
+        metavar="N",
+        help="With --quarantine, delete batches older than N days in the background",
+    )
+    parser.add_argument(
+        "--wait-scan",
+        action="store_true",
+        help="Wait for the library rescan to finish and report its duration",
+    )
+    parser.add_argument(
+        "--scan-timeout",
+        type=float,
+        default=DEFAULT_SCAN_TIMEOUT,
+        help="Seconds to wait for the rescan with --wait-scan "
+        f"(default: {DEFAULT_SCAN_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--scan-mode",
+        choices=SCAN_MODES,
+        default="auto",
+        help="Rescan type; auto runs a full scan when more than "
+        "--full-scan-threshold albums were removed (default: auto)",
+    )
+    parser.add_argument(
+        "--full-scan-threshold",
+        type=int,
+        default=DEFAULT_FULL_SCAN_THRESHOLD,
+        help=f"Removed albums that trigger a full scan in auto mode "
+        f"(default: {DEFAULT_FULL_SCAN_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print per-phase wall times and per-endpoint request latencies",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        type=Path,
+        metavar="PATH",
+        help="Write phase and request metrics as JSON to PATH",
+    )
     args = parser.parse_args()
 
     username = os.environ.get("NAVIDROME_USER")
@@ -291,48 +1642,84 @@ def main() -> None:
         print("Error: set NAVIDROME_USER and NAVIDROME_PASSWORD env vars.")
         sys.exit(1)
 
-    dry_run = not args.execute
-    base_url = args.url.rstrip("/")
-    music_root = args.music_root
-
-    print(f"Server:     {base_url}")
-    print(f"Music root: {music_root}")
-    print(f"Filter:     rating {args.min_rating}-{args.max_rating}")
-    print(f"Mode:       {'DRY RUN' if dry_run else 'EXECUTE'}")
-
-    # Authenticate
-    subsonic_params = generate_subsonic_params(username, password)
-    native_token = get_native_token(base_url, username, password)
+    if args.purge_days is not None and args.quarantine is None:
+        print("Error: --purge-days requires --quarantine.")
+        sys.exit(1)
 
-    # Fetch and filter albums
-    print("\nFetching albums...")
-    start = time.monotonic()
-    all_albums = fetch_all_albums(base_url, subsonic_params)
-    elapsed = time.monotonic() - start
-    print(f"Found {len(all_albums)} albums ({elapsed:.1f}s)")
+    dry_run = not args.execute
+    quarantine_dir = None
+    batch = time.strftime(QUARANTINE_BATCH_FORMAT)
+    if args.quarantine is not None:
+        # The rescan after the moves would re-import albums quarantined
+        # inside the library, and --scan-root would index them as a genre
+        if args.quarantine.resolve().is_relative_to(args.music_root.resolve()):
+            print(
+                f"Error: --quarantine {args.quarantine} must not be inside "
+                f"the music root {args.music_root}."
+            )
+            sys.exit(1)
+        quarantine_dir = args.quarantine / batch
+        if not dry_run:
+            args.quarantine.mkdir(parents=True, exist_ok=True)
+            if (
+                args.music_root.exists()
+                and args.quarantine.stat().st_dev != args.music_root.stat().st_dev
+            ):
+                print(
+                    f"Error: {args.quarantine} is not on the same filesystem "
+                    f"as {args.music_root}."
+                )
+                sys.exit(1)
 
-    matched = filter_by_rating(all_albums, args.min_rating, args.max_rating)
-    print(
-        f"Matched {len(matched)} albums with rating {args.min_rating}-{args.max_rating}"
+    base_url = args.url.rstrip("/")
+    client = NavidromeClient(
+        base_url,
+        timeout=args.timeout,
+        max_concurrency=args.concurrency,
+        retries=args.retries,
     )
-
-    if not matched:
-        print("Nothing to do.")
-        return
-
-    # Resolve full paths via native API
-    print("Resolving paths...")
-    plan = build_plan(matched, base_url, native_token, music_root)
-    print_plan(plan, dry_run)
-
-    if not dry_run and plan:
-        print("\nDeleting directories...")
-        ok_count, fail_count = execute_deletions(plan)
-        print(f"\nDone: {ok_count} deleted, {fail_count} failed/skipped")
-
-        if ok_count > 0:
-            print("\nTriggering library rescan...")
-            trigger_rescan(base_url, subsonic_params)
+    catalog = None
+    if not args.no_catalog:
+        catalog = AlbumCatalog(args.catalog, f"{base_url}|{username}")
+    try:
+        # Old quarantine batches are purged while the cleanup runs, so the
+        # rescan never waits on deleting them
+        with ThreadPoolExecutor(max_workers=1) as background:
+            purge = None
+            if args.purge_days is not None:
+                purge = background.submit(
+                    purge_quarantine, args.quarantine, args.purge_days, batch, dry_run
+                )
+            run_cleanup(client, catalog, args, username, password, quarantine_dir)
+            if purge is not None:
+                print_purge(purge.result(), dry_run)
+    finally:
+        if catalog is not None:
+            catalog.close()
+        client.close()
+        print(f"\nHTTP connections: {client.opened} opened, {client.reused} reused")
+        limiter = client.limiter
+        print(
+            f"Concurrency: settled at {int(limiter.limit)}/{limiter.max_limit} "
+            f"({limiter.decreases} backoffs, {client.retried} retries)"
+        )
+        if args.timings or args.metrics_json:
+            summary = client.metrics.summary()
+            summary["connections"] = {
+                "opened": client.opened,
+                "reused": client.reused,
+            }
+            summary["concurrency"] = {
+                "settled": int(limiter.limit),
+                "max": limiter.max_limit,
+                "backoffs": limiter.decreases,
+                "retries": client.retried,
+            }
+            if args.timings:
+                print_metrics(summary)
+            if args.metrics_json:
+                args.metrics_json.write_text(json.dumps(summary, indent=2) + "\n")
+                print(f"\nMetrics written to {args.metrics_json}")
 
 
 if __name__ == "__main__":
@@ -5,25 +5,87 @@ Convert Obsidian notes to Zettelkasten naming convention.
 - Renames files from 'Note Title.md' to 'YYYYMMDDHHmmss.md'
 - Adds original title (lowercase) to frontmatter title and aliases
 - Sets appropriate tag based on directory (📥 for inbox, 📝 for notes)
+- Walks subdirectories too, skipping hidden folders and attachments
 - Skips files already named with timestamp
+- Remembers converted notes in a manifest so unchanged ones are skipped
+- Rewrites [[Note Title]] links across the vault to the new names
+- With --watch, keeps running and converts notes as they arrive
+- Journals planned renames so an interrupted run can be resumed
 """
 
 import argparse
+import contextlib
+import ctypes
+import ctypes.util
+import fcntl
+import fnmatch
+import hashlib
+import json
+import os
 import re
+import select
+import struct
 import sys
+import time
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
-# Directory to tag mapping
+# Directory to tag mapping, the longest matching path prefix wins
 DIR_TAGS = {
     "inbox": "📥",
     "notes": "📝",
 }
+DEFAULT_TAG = "📝"
+
+# Directory and file names never descended into or converted
+IGNORE_PATTERNS = (".*", "attachments", "_attachments", "assets")
+
+# Notes handed to a worker process at a time with --jobs
+CONVERT_CHUNKSIZE = 16
+
+# First characters of a frontmatter line that cannot start a new key
+FRONTMATTER_CONTINUATION = (" ", "\t", "-", "#", "\n", "\r")
+# Characters read at a time when only the frontmatter is needed
+HEADER_CHUNK = 4096
+# Closing frontmatter delimiter line
+FRONTMATTER_END_RE = re.compile(r"^(?:---|\.\.\.)[ \t]*$", re.MULTILINE)
+
+# Manifest of converted notes, relative to the vault root
+MANIFEST_NAME = ".zettelkasten-manifest.json"
+MANIFEST_VERSION = 1
+
+# Write-ahead journal of planned conversions, relative to the vault root,
+# and how many plans are logged per fsync
+JOURNAL_NAME = ".zettelkasten-journal.jsonl"
+JOURNAL_VERSION = 1
+JOURNAL_BATCH = 256
+
+# Watch mode: quiet period before a note is converted, and the rescan
+# interval where inotify is unavailable
+WATCH_DEBOUNCE = 1.0
+WATCH_POLL_INTERVAL = 2.0
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+INOTIFY_EVENT = struct.Struct("iIII")
+
+# [[target#anchor|display]], also matches the inner part of ![[embeds]]
+WIKILINK_RE = re.compile(r"\[\[([^\[\]|#^\n]+)([#^][^\[\]|\n]*)?(\|[^\[\]\n]*)?\]\]")
 
 
 def is_timestamp_name(name: str) -> bool:
-    """Check if filename is already a 14-digit timestamp."""
-    return bool(re.match(r"^\d{14}$", name))
+    """Check if filename is already a 14-digit timestamp (collision suffix allowed)."""
+    return bool(re.match(r"^\d{14}(_\d+)?$", name))
 
 
 def get_creation_time(path: Path) -> str:
@@ -34,36 +96,194 @@ def get_creation_time(path: Path) -> str:
     return datetime.fromtimestamp(ctime).strftime("%Y%m%d%H%M%S")
 
 
-def parse_frontmatter(content: str) -> tuple[dict | None, str, str]:
+def tag_for_dir(rel_dir: str, dir_tags: dict[str, str]) -> str:
+    """Find the tag for a vault-relative directory by longest prefix."""
+    parts = rel_dir.split("/")
+    for end in range(len(parts), 0, -1):
+        tag = dir_tags.get("/".join(parts[:end]))
+        if tag:
+            return tag
+    return DEFAULT_TAG
+
+
+def is_ignored(name: str, ignore: tuple[str, ...]) -> bool:
+    """Check a file or directory name against ignore patterns."""
+    return any(fnmatch.fnmatch(name, pattern) for pattern in ignore)
+
+
+def walk_notes(root: Path, ignore: tuple[str, ...]):
+    """
+    Yield notes under root depth-first, sorted within each directory.
+    Built on os.scandir so type checks need no extra stat; files are
+    yielded as soon as their directory is listed.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(f"Warning: Cannot read {directory}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            if is_ignored(entry.name, ignore):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name.endswith(".md") and entry.is_file():
+                yield Path(entry.path)
+        stack.extend(reversed(subdirs))
+
+
+def parse_frontmatter(content: str) -> tuple[dict[str, str] | None, str, str]:
     """
-    Parse frontmatter from content.
-    Returns: (frontmatter_dict or None, frontmatter_raw, body)
+    Scan frontmatter in a single pass over its lines. The closing
+    delimiter is located first, so the body is never split or scanned.
+    Returns: (entries or None, frontmatter_raw, body)
+    entries maps each top-level key to its raw text, continuation lines
+    (block lists, nested maps) included, so it can be written back as is.
+    Comments or blank lines before the first key are kept under "".
     """
-    if not content.startswith("---"):
+    first_end = content.find("\n")
+    if first_end == -1 or content[:first_end].rstrip() != "---":
         return None, "", content
 
-    # Find closing ---
-    match = re.match(r"^---\n(.*?)\n---\n?", content, re.DOTALL)
-    if not match:
+    closing = FRONTMATTER_END_RE.search(content, first_end + 1)
+    if not closing:
         return None, "", content
 
-    frontmatter_raw = match.group(1)
-    body = content[match.end() :]
+    entries = {}
+    key = ""
+    current: list[str] = []
+    for line in content[first_end + 1 : closing.start()].splitlines(keepends=True):
+        # A top-level key starts at column 0; anything else continues the
+        # current entry
+        if line[0] not in FRONTMATTER_CONTINUATION and ":" in line:
+            if current:
+                entries[key] = "".join(current)
+            key = line.partition(":")[0].strip()
+            current = []
+        current.append(line)
+    if current:
+        entries[key] = "".join(current)
+
+    frontmatter_raw = content[first_end + 1 : closing.start()].removesuffix("\n")
+    body_start = closing.end() + (content[closing.end() : closing.end() + 1] == "\n")
+    return entries, frontmatter_raw, content[body_start:]
+
+
+def read_frontmatter(path: Path) -> tuple[dict[str, str] | None, str]:
+    """
+    Read only the frontmatter block of a note from disk, in chunks.
+    Returns: (entries or None, header text including both delimiters)
+    """
+    with path.open(encoding="utf-8") as f:
+        text = f.read(HEADER_CHUNK)
+        if not text.startswith("---"):
+            return None, ""
+        eof = False
+        while True:
+            # The delimiter line must be complete before it is trusted
+            closing = FRONTMATTER_END_RE.search(text, text.find("\n") + 1)
+            if closing and (closing.end() < len(text) or eof):
+                entries, _, body = parse_frontmatter(text)
+                if entries is None:
+                    return None, ""
+                return entries, text[: len(text) - len(body)]
+            if eof:
+                return None, ""
+            chunk = f.read(HEADER_CHUNK)
+            eof = not chunk
+            text += chunk
+
+
+def split_flow_list(text: str) -> list[str]:
+    """
+    Split the inside of a [a, "b, c"] flow list on top-level commas.
+    text may run past the list; it ends at the first unquoted ] that
+    closes it, so items such as "[[Link]]" stay whole.
+    """
+    items = []
+    current = []
+    quote = None
+    depth = 0
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            if not depth:
+                break
+            depth -= 1
+        elif char == "," and not depth:
+            items.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    items.append("".join(current))
+    return [unquote(item) for item in items if item.strip()]
+
+
+def unquote(value: str) -> str:
+    """Strip whitespace and one level of matching YAML quotes."""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    return value
+
+
+def frontmatter_value(entry: str) -> str | list[str]:
+    """Decode a scalar, flow list or block list from a raw entry."""
+    head, _, rest = entry.partition("\n")
+    value = head.partition(":")[2].strip()
+
+    if value.startswith("["):
+        # Flow lists may wrap over several lines
+        return split_flow_list(" ".join([value, *rest.split("\n")])[1:])
+    if value:
+        return unquote(value)
 
-    # Simple YAML parsing for our use case
-    fm = {}
-    for line in frontmatter_raw.split("\n"):
-        if ":" in line:
-            key, _, value = line.partition(":")
-            key = key.strip()
-            value = value.strip()
-            fm[key] = value
+    items = []
+    for line in rest.split("\n"):
+        line = line.strip()
+        if line.startswith("- ") or line == "-":
+            items.append(unquote(line[1:]))
+    return items
 
-    return fm, frontmatter_raw, body
+
+def first_value(entries: dict[str, str], key: str) -> str | None:
+    """Get a scalar, or the first item of a list, for key."""
+    entry = entries.get(key)
+    if entry is None:
+        return None
+    value = frontmatter_value(entry)
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    return value or None
+
+
+def yaml_item(value: str) -> str:
+    """Quote a list item only when it cannot stay a plain YAML scalar."""
+    plain = (
+        value
+        and value == value.strip()
+        and value[0] not in "-?:,[]{}#&*!|>'\"%@`"
+        and ": " not in value
+        and " #" not in value
+        and not value.endswith(":")
+    )
+    return value if plain else json.dumps(value, ensure_ascii=False)
 
 
 def build_frontmatter(
-    title: str, tag: str, created: str, existing_fm: dict | None
+    title: str, tag: str, created: str, existing_fm: dict[str, str] | None
 ) -> str:
     """Build new frontmatter with title, tags, aliases, and created date."""
     title_lower = title.lower()
@@ -73,37 +293,142 @@ def build_frontmatter(
         "%Y-%m-%d %H:%M:%S"
     )
 
-    # Preserve any extra fields from existing frontmatter
-    extra_lines = []
+    # The title leads the aliases; existing ones follow, without duplicates
+    aliases = [title_lower]
+    seen = {title_lower.casefold()}
+
+    # Preserve any extra fields from existing frontmatter, byte for byte;
+    # comments above the first key stay on top
+    preamble = extra = ""
     if existing_fm:
         skip_keys = {"title", "tags", "aliases", "created"}
-        for key, value in existing_fm.items():
-            if key.lower() not in skip_keys:
-                extra_lines.append(f"{key}: {value}")
+        preamble = existing_fm.get("", "")
+        for key, entry in existing_fm.items():
+            if key.lower() != "aliases":
+                continue
+            value = frontmatter_value(entry)
+            for alias in [value] if isinstance(value, str) else value:
+                if alias and alias.casefold() not in seen:
+                    seen.add(alias.casefold())
+                    aliases.append(alias)
+        extra = "".join(
+            entry
+            for key, entry in existing_fm.items()
+            if key and key.lower() not in skip_keys
+        )
+        if extra and not extra.endswith("\n"):
+            extra += "\n"
 
     lines = [
-        "---",
-        f"title: {title_lower}",
+        "---\n" + preamble + f"title: {title_lower}",
         f"created: {created_formatted}",
         f"tags: [{tag}]",
         "aliases:",
-        f"  - {title_lower}",
+        *(f"  - {yaml_item(alias)}" for alias in aliases),
     ]
 
-    if extra_lines:
-        lines.extend(extra_lines)
+    return "\n".join(lines) + "\n" + extra + "---\n"
+
+
+def content_hash(data: bytes) -> str:
+    """Hash note content for the manifest."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(path: Path) -> dict[str, dict]:
+    """Load manifest entries keyed by vault-relative path."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    notes = data.get("notes")
+    return notes if isinstance(notes, dict) else {}
+
+
+def save_manifest(path: Path, entries: dict[str, dict]) -> None:
+    """Write manifest atomically via a temporary file."""
+    tmp = path.with_name(path.name + ".tmp")
+    data = {"version": MANIFEST_VERSION, "notes": dict(sorted(entries.items()))}
+    tmp.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def manifest_entry(path: Path, digest: str | None) -> dict:
+    """
+    Describe a note as stored in the manifest.
+    digest is None for notes left untouched and never read in full.
+    """
+    stat = path.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
+
+
+def is_unchanged(path: Path, entry: dict | None) -> bool:
+    """
+    Check a note against its manifest entry.
+    mtime and size are compared first; the file is only read and hashed
+    when they differ, so a touched but identical note still counts as
+    unchanged. Refreshes entry in place in that case.
+    """
+    if not entry:
+        return False
+    stat = path.stat()
+    if stat.st_mtime_ns == entry.get("mtime_ns") and stat.st_size == entry.get("size"):
+        return True
+    if stat.st_size != entry.get("size") or not entry.get("sha256"):
+        return False
+    if content_hash(path.read_bytes()) != entry.get("sha256"):
+        return False
+    entry["mtime_ns"] = stat.st_mtime_ns
+    return True
+
+
+class NameAllocator:
+    """
+    Hand out collision-free timestamp names, reserved in memory.
+    Each directory is listed once; after that every allocation is a set
+    lookup, and the next free suffix per timestamp is remembered so a
+    bulk import sharing one second does not rescan earlier suffixes.
+    """
+
+    def __init__(self):
+        self._taken: dict[Path, set[str]] = {}
+        self._next_suffix: dict[tuple[Path, str], int] = {}
 
-    lines.append("---")
+    def _names(self, directory: Path) -> set[str]:
+        names = self._taken.get(directory)
+        if names is None:
+            names = self._taken[directory] = set(os.listdir(directory))
+        return names
 
-    return "\n".join(lines) + "\n"
+    def allocate(self, directory: Path, timestamp: str) -> Path:
+        """Reserve and return the first free name for timestamp."""
+        names = self._names(directory)
+        name = f"{timestamp}.md"
+        if name in names:
+            key = (directory, timestamp)
+            suffix = self._next_suffix.get(key, 1)
+            while f"{timestamp}_{suffix}.md" in names:
+                suffix += 1
+            name = f"{timestamp}_{suffix}.md"
+            self._next_suffix[key] = suffix + 1
+        names.add(name)
+        return directory / name
 
 
-def convert_note(
-    path: Path, dir_name: str, dry_run: bool, update_existing: bool = False
-) -> dict | None:
+def plan_note(
+    path: Path,
+    tag: str,
+    update_existing: bool,
+    allocator: NameAllocator,
+    entry: dict | None = None,
+) -> dict:
     """
-    Convert single note.
-    Returns info about changes, or None if skipped.
+    Decide whether and where a single note is renamed.
+    Runs serially so every name is reserved before any note is written,
+    which keeps dry runs and real runs identical.
+    Returns a task for convert_note, or a skip result.
     """
     stem = path.stem  # filename without extension
 
@@ -113,54 +438,246 @@ def convert_note(
     if already_timestamp and not update_existing:
         return {"path": path, "skipped": True, "reason": "already timestamp"}
 
+    if already_timestamp and is_unchanged(path, entry):
+        return {"path": path, "skipped": True, "reason": "unchanged"}
+
     # Get timestamp from filename or creation time
     if already_timestamp:
-        timestamp = stem
+        timestamp = stem[:14]  # drop any collision suffix
         new_path = path  # Don't rename
-        # Get title from existing frontmatter
-        content = path.read_text(encoding="utf-8")
-        existing_fm, _, body = parse_frontmatter(content)
+    else:
+        timestamp = get_creation_time(path)
+        new_path = allocator.allocate(path.parent, timestamp)
+
+    return {
+        "path": path,
+        "tag": tag,
+        "timestamp": timestamp,
+        "new_path": new_path,
+        "updated": already_timestamp,
+        "skipped": False,
+    }
+
+
+def temp_path(path: Path) -> Path:
+    """Hidden temporary file next to path, skipped by walk_notes."""
+    return path.with_name(f".{path.name}.tmp")
+
+
+def replace_file(path: Path, data: bytes, sync: bool) -> None:
+    """
+    Write data to a temporary file and swap it in over path, so a crash
+    leaves either the old content or the new. With sync the data is
+    fsynced before the swap, which is needed whenever no other copy of
+    the note survives: the rename can reach the disk before the data.
+    """
+    tmp = temp_path(path)
+    with tmp.open("wb") as f:
+        f.write(data)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def fsync_path(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    """
+    Write-ahead journal of planned conversions.
+    Plans are logged before their notes are touched and completions after;
+    both are fsynced once per JOURNAL_BATCH plans rather than per note.
+    Rewritten notes that got a new name are fsynced in the same batch, and
+    only then are their originals deleted, so until a note is durable its
+    old copy is still there for --resume to convert again. Every operation
+    can be redone safely, so a completion lost in a crash only means that
+    note is checked again on --resume.
+    """
+
+    def __init__(self, path: Path, vault_path: Path):
+        self.path = path
+        self._vault = vault_path
+        new = not path.exists()
+        self._file = path.open("a", encoding="utf-8")
+        # A record lock belongs to this process only, so --jobs workers
+        # left behind by a killed run do not keep the vault locked
+        try:
+            fcntl.lockf(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._file.close()
+            raise RuntimeError(f"another run is using {path.name}") from None
+        self._dirty_dirs: set[Path] = set()
+        # Rewritten notes whose data is not fsynced yet, and their originals
+        self._unsynced: list[Path] = []
+        self._stale: list[Path] = []
+        if new:
+            self._write({"op": "start", "version": JOURNAL_VERSION})
+            self.sync()
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _rel(self, path: Path) -> str:
+        return path.relative_to(self._vault).as_posix()
+
+    def plan(self, tasks: list[dict]) -> None:
+        """Log a batch of tasks and make it durable before they run."""
+        for task in tasks:
+            self._write(
+                {
+                    "op": "plan",
+                    "path": self._rel(task["path"]),
+                    "new_path": self._rel(task["new_path"]),
+                    "timestamp": task["timestamp"],
+                    "tag": task["tag"],
+                    "updated": task["updated"],
+                }
+            )
+        self.sync()
+
+    def done(self, result: dict) -> None:
+        """Log a finished note; made durable with the next sync."""
+        self._write({"op": "done", "path": self._rel(result["path"])})
+        self._dirty_dirs.add(result["new_path"].parent)
+        if result.get("stale"):
+            self._unsynced.append(result["new_path"])
+            self._stale.append(result["stale"])
+
+    def _sync_dirs(self) -> None:
+        for directory in self._dirty_dirs:
+            # fsync is not supported for directories everywhere
+            with contextlib.suppress(OSError):
+                fsync_path(directory)
+        self._dirty_dirs.clear()
+
+    def sync(self) -> None:
+        """
+        fsync new notes, the directories renamed into and the journal, then
+        delete the originals those notes replace.
+        """
+        for path in self._unsynced:
+            fsync_path(path)
+        self._sync_dirs()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        for path in self._stale:
+            path.unlink(missing_ok=True)
+            self._dirty_dirs.add(path.parent)
+        self._sync_dirs()
+        self._unsynced.clear()
+        self._stale.clear()
+
+    def close(self) -> None:
+        self.sync()
+        self._file.close()
+
+    def remove(self) -> None:
+        """Drop the journal once the whole run, links included, finished."""
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+
+def load_journal(path: Path, vault_path: Path) -> tuple[list[dict], list[dict]]:
+    """
+    Read a journal left by an interrupted run.
+    Returns: (tasks to redo, results of notes already converted)
+    Originals are deleted only once their new copy is fsynced, so a
+    renamed note is redone whenever its old file still exists, and the new
+    file is trusted only when the old one is gone and it is not empty.
+    """
+    plans: dict[str, dict] = {}
+    done: set[str] = set()
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break  # torn final line
+            if record.get("op") == "plan":
+                plans[record["path"]] = record
+            elif record.get("op") == "done":
+                done.add(record["path"])
+
+    tasks = []
+    finished = []
+    for rel, record in plans.items():
+        old = vault_path / rel
+        new = vault_path / record["new_path"]
+        temp_path(new).unlink(missing_ok=True)
+        moved = {"path": old, "new_path": new}
+        if old != new and not old.exists():
+            if new.exists() and new.stat().st_size > 0:
+                finished.append(moved)
+            else:
+                print(f"Warning: Journaled note is gone: {rel}")
+        elif old == new and rel in done:
+            finished.append(moved)
+        elif old.exists():
+            tasks.append(
+                {
+                    "path": old,
+                    "new_path": new,
+                    "timestamp": record["timestamp"],
+                    "tag": record["tag"],
+                    "updated": record["updated"],
+                    "skipped": False,
+                }
+            )
+        else:
+            print(f"Warning: Journaled note is gone: {rel}")
+    return tasks, finished
+
+
+def journaled(tasks: Iterable[dict], journal: Journal):
+    """Pass tasks through once their batch is durable in the journal."""
+    batch = []
+    for task in tasks:
+        batch.append(task)
+        if len(batch) >= JOURNAL_BATCH:
+            journal.plan(batch)
+            yield from batch
+            batch = []
+    if batch:
+        journal.plan(batch)
+        yield from batch
+
+
+def convert_note(task: dict, dry_run: bool) -> dict:
+    """
+    Convert single note planned by plan_note.
+    Returns info about changes.
+    """
+    path = task["path"]
+    new_path = task["new_path"]
+    timestamp = task["timestamp"]
+    already_timestamp = task["updated"]
+
+    # Read only the header; the body is read when the note is rewritten
+    existing_fm, header = read_frontmatter(path)
+
+    if already_timestamp:
         # Use existing title/alias or filename
         title = None
         if existing_fm:
-            title = existing_fm.get("title")
-            if not title:
-                aliases = existing_fm.get("aliases", "")
-                if aliases and aliases not in ("[]", ""):
-                    # Extract first alias
-                    match = re.search(r"\[([^\]]+)\]", aliases)
-                    if match:
-                        title = match.group(1).strip().strip("'\"")
+            title = first_value(existing_fm, "title") or first_value(
+                existing_fm, "aliases"
+            )
         if not title:
-            title = stem  # fallback to timestamp
+            title = path.stem  # fallback to timestamp
     else:
-        # Get creation timestamp
-        timestamp = get_creation_time(path)
-        title = stem
-
-        # Check for collision
-        new_path = path.parent / f"{timestamp}.md"
-        if new_path.exists() and new_path != path:
-            # Add suffix to avoid collision
-            suffix = 1
-            while new_path.exists():
-                new_path = path.parent / f"{timestamp}_{suffix}.md"
-                suffix += 1
-
-        # Read content
-        content = path.read_text(encoding="utf-8")
-
-        # Parse existing frontmatter
-        existing_fm, _, body = parse_frontmatter(content)
+        title = path.stem
 
-    # Get tag for directory
-    tag = DIR_TAGS.get(dir_name, "📝")
+    tag = task["tag"]
 
     # Build new frontmatter
     new_frontmatter = build_frontmatter(title, tag, timestamp, existing_fm)
-
-    # New content
-    new_content = new_frontmatter + body
+    rewrite = new_frontmatter != header
 
     result = {
         "path": path,
@@ -169,18 +686,549 @@ def convert_note(
         "tag": tag,
         "skipped": False,
         "updated": already_timestamp,
+        "rewritten": rewrite,
+        "manifest": None,
     }
 
     if not dry_run:
-        # Write new content
-        path.write_text(new_content, encoding="utf-8")
-        # Rename file only if path changed
-        if new_path != path:
+        digest = None
+        if rewrite:
+            # New content
+            content = path.read_text(encoding="utf-8")
+            data = (new_frontmatter + content[len(header) :]).encode("utf-8")
+            # A renamed note keeps its original until the new copy is
+            # fsynced in a batch (see record_done); one updated in place
+            # has no other copy, so it is synced before the swap
+            replace_file(new_path, data, sync=new_path == path)
+            if new_path != path:
+                result["stale"] = path
+            digest = content_hash(data)
+        elif new_path != path:
+            # Rename file only if path changed
             path.rename(new_path)
+        result["manifest"] = manifest_entry(new_path, digest)
+
+    return result
+
+
+def convert_all(
+    tasks: Iterable[dict], dry_run: bool, jobs: int, journal: Journal | None = None
+) -> list[dict]:
+    """
+    Convert planned notes, across a process pool when jobs > 1.
+    tasks may be a generator: notes are converted while it is still
+    producing. With a journal, tasks are logged before they run and
+    completions after. Results keep the order of tasks.
+    """
+    if journal:
+        tasks = journaled(tasks, journal)
+
+    if jobs <= 1:
+        results = [record_done(convert_note(task, dry_run), journal) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            converted = executor.map(
+                partial(convert_note, dry_run=dry_run),
+                tasks,
+                chunksize=CONVERT_CHUNKSIZE,
+            )
+            results = [record_done(r, journal) for r in converted]
+    if journal:
+        # Originals still pending deletion must be gone before links are
+        # rewritten across the vault
+        journal.sync()
+    return results
+
+
+def record_done(result: dict, journal: Journal | None) -> dict:
+    """Log a finished note; without a journal, settle its rename now."""
+    if journal:
+        journal.done(result)
+    elif result.get("stale"):
+        fsync_path(result["new_path"])
+        result["stale"].unlink()
+    return result
+
+
+def build_link_map(
+    results: list[dict], vault_path: Path, notes: list[Path]
+) -> dict[str, str]:
+    """
+    Map casefolded old link targets of renamed notes to their new targets.
+    Both bare titles and vault-relative paths are keys; a bare title shared
+    with another renamed note or with a note that keeps its name is left
+    out as ambiguous. A new name that is not unique in the vault is linked
+    by its path.
+    """
+    renamed = [r for r in results if r["new_path"] != r["path"]]
+    # Notes as they are after the run, whether or not it was a dry run
+    old_paths = {r["path"] for r in renamed}
+    final = {path for path in notes if path not in old_paths}
+    final.update(r["new_path"] for r in renamed)
+    stem_counts = Counter(path.stem.casefold() for path in final)
+    link_map = {}
+    by_title: dict[str, list[str]] = {}
+    for r in renamed:
+        old_rel = r["path"].relative_to(vault_path).with_suffix("").as_posix()
+        new_rel = r["new_path"].relative_to(vault_path).with_suffix("").as_posix()
+        new_stem = r["new_path"].stem
+        target = new_stem if stem_counts[new_stem.casefold()] == 1 else new_rel
+        link_map[old_rel.casefold()] = new_rel
+        by_title.setdefault(r["path"].stem.casefold(), []).append(target)
+
+    for title, targets in by_title.items():
+        if len(targets) == 1 and not stem_counts[title]:
+            link_map[title] = targets[0]
+    return link_map
+
+
+def link_key(target: str) -> str:
+    """Normalize a wikilink target the way link_map keys are stored."""
+    key = target.strip()
+    if key.lower().endswith(".md"):
+        key = key[:-3]
+    return key.casefold()
+
+
+def rewrite_links(path: Path, link_map: dict[str, str], dry_run: bool) -> dict:
+    """
+    Rewrite wikilinks in a single note in one pass.
+    Every [[...]] is found by one regex and looked up in link_map, so the
+    cost is linear in the note size however many notes were renamed.
+    The old title is kept as the link's display text.
+    """
+    content = path.read_text(encoding="utf-8")
+    count = 0
+
+    def replace(match: re.Match) -> str:
+        nonlocal count
+        target, anchor, display = match.groups()
+        key = target.strip()
+        if key.lower().endswith(".md"):
+            key = key[:-3]
+        new_target = link_map.get(link_key(target))
+        if new_target is None:
+            return match.group(0)
+        count += 1
+        display = display or "|" + key.rpartition("/")[2]
+        return f"[[{new_target}{anchor or ''}{display}]]"
+
+    new_content = WIKILINK_RE.sub(replace, content)
+    result = {"path": path, "links": count, "manifest": None}
+
+    if count and not dry_run:
+        data = new_content.encode("utf-8")
+        # Any note in the vault may be touched here, and no other copy of
+        # it survives, so write it durably before swapping it in
+        replace_file(path, data, sync=True)
+        result["manifest"] = manifest_entry(path, content_hash(data))
 
     return result
 
 
+# Link map of the current rewrite, set once per worker process
+_worker_link_map: dict[str, str] = {}
+
+
+def _init_link_worker(link_map: dict[str, str]) -> None:
+    global _worker_link_map
+    _worker_link_map = link_map
+
+
+def _rewrite_in_worker(path: Path, dry_run: bool) -> dict:
+    return rewrite_links(path, _worker_link_map, dry_run)
+
+
+def rewrite_all(
+    paths: list[Path], link_map: dict[str, str], dry_run: bool, jobs: int
+) -> list[dict]:
+    """
+    Rewrite links in every note, across a process pool when jobs > 1.
+    The link map is sent to each worker once, not with every chunk.
+    Results keep the order of paths.
+    """
+    if jobs <= 1 or len(paths) < 2:
+        return [rewrite_links(path, link_map, dry_run) for path in paths]
+
+    chunksize = max(1, len(paths) // (jobs * 8))
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_link_worker, initargs=(link_map,)
+    ) as executor:
+        return list(
+            executor.map(
+                partial(_rewrite_in_worker, dry_run=dry_run),
+                paths,
+                chunksize=chunksize,
+            )
+        )
+
+
+class LinkIndex:
+    """
+    Link targets of every note in the vault, kept across watch batches.
+    refresh() stats every note but only re-reads the ones whose size or
+    mtime changed, so notes edited outside the watched trees are seen too.
+    """
+
+    def __init__(self, vault_path: Path, ignore: tuple[str, ...]):
+        self.vault_path = vault_path
+        self.ignore = ignore
+        self._stats: dict[Path, tuple[int, int]] = {}
+        self._targets: dict[Path, set[str]] = {}
+        self._linked_from: dict[str, set[Path]] = {}
+
+    def _drop(self, path: Path) -> None:
+        self._stats.pop(path, None)
+        for key in self._targets.pop(path, ()):
+            sources = self._linked_from[key]
+            sources.discard(path)
+            if not sources:
+                del self._linked_from[key]
+
+    def _index(self, path: Path, stat: tuple[int, int]) -> None:
+        self._drop(path)
+        try:
+            content = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            # Left unindexed, so it is retried on the next refresh
+            return
+        keys = {link_key(m.group(1)) for m in WIKILINK_RE.finditer(content)}
+        self._stats[path] = stat
+        self._targets[path] = keys
+        for key in keys:
+            self._linked_from.setdefault(key, set()).add(path)
+
+    def refresh(self) -> list[Path]:
+        """Bring the index up to date with the vault; return its notes."""
+        current = {}
+        for path in walk_notes(self.vault_path, self.ignore):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            current[path] = (st.st_mtime_ns, st.st_size)
+        for path in self._stats.keys() - current.keys():
+            self._drop(path)
+        for path, stat in current.items():
+            if self._stats.get(path) != stat:
+                self._index(path, stat)
+        return list(current)
+
+    def linking_to(self, keys: Iterable[str]) -> list[Path]:
+        """Notes that contain a link to any of the given link_map keys."""
+        found = set()
+        for key in keys:
+            found.update(self._linked_from.get(key, ()))
+        return sorted(found)
+
+
+def convert_notes(
+    vault_path: Path,
+    paths: Iterable[Path],
+    options: dict,
+    manifest: dict[str, dict],
+    new_manifest: dict[str, dict],
+    journal: Journal | None = None,
+    resume: tuple[list[dict], list[dict]] | None = None,
+    link_index: LinkIndex | None = None,
+) -> dict:
+    """
+    Plan, convert and relink a stream of notes.
+    manifest is consulted for skipping; new_manifest receives the entries
+    to save. resume is what load_journal returned: its unfinished notes
+    are converted first, and the renames of both feed the link rewrite.
+    With a link_index only the notes linking to a renamed note are read
+    for the rewrite, instead of the whole vault.
+    Returns a report for print_report.
+    """
+    dry_run = options["dry_run"]
+    skipped = []
+    unchanged = 0
+    allocator = NameAllocator()
+
+    def planned_tasks():
+        """Plan notes as they arrive, feeding conversion directly."""
+        nonlocal unchanged
+        for md_file in paths:
+            key = md_file.relative_to(vault_path).as_posix()
+            tag = tag_for_dir(key.rpartition("/")[0], options["dir_tags"])
+            entry = manifest.get(key)
+            # --full ignores the manifest for skipping only, so entries of
+            # notes that stay as they are still carry over
+            plan_entry = None if options["full"] else entry
+            task = plan_note(
+                md_file, tag, options["update_existing"], allocator, plan_entry
+            )
+            if task.get("reason") == "unchanged":
+                unchanged += 1
+                new_manifest[key] = entry
+            elif task.get("skipped"):
+                skipped.append(task)
+                if entry:
+                    new_manifest[key] = entry
+            else:
+                yield task
+
+    # Finish the interrupted run before walking, so its notes are not
+    # planned a second time under new names
+    resume_tasks, finished = resume or ([], [])
+    results = convert_all(resume_tasks, dry_run, options["jobs"], journal)
+    results += convert_all(planned_tasks(), dry_run, options["jobs"], journal)
+
+    if not dry_run:
+        for r in results:
+            new_manifest.pop(r["path"].relative_to(vault_path).as_posix(), None)
+            key = r["new_path"].relative_to(vault_path).as_posix()
+            new_manifest[key] = r["manifest"]
+
+    # Rewrite links once every note has its final name
+    moves = finished + results
+    renamed = any(r["new_path"] != r["path"] for r in moves)
+    link_results = []
+    if renamed and options["links"]:
+        if link_index is None:
+            notes = list(walk_notes(vault_path, options["ignore"]))
+            link_map = build_link_map(moves, vault_path, notes)
+            candidates = notes
+        else:
+            notes = link_index.refresh()
+            link_map = build_link_map(moves, vault_path, notes)
+            candidates = link_index.linking_to(link_map)
+        link_results = [
+            r
+            for r in rewrite_all(candidates, link_map, dry_run, options["jobs"])
+            if r["links"]
+        ]
+        for r in link_results:
+            key = r["path"].relative_to(vault_path).as_posix()
+            if r["manifest"] and key in new_manifest:
+                new_manifest[key] = r["manifest"]
+
+    return {
+        "results": results,
+        "skipped": skipped,
+        "unchanged": unchanged,
+        "links": link_results,
+    }
+
+
+def print_report(vault_path: Path, report: dict, dry_run: bool) -> None:
+    """Print what a conversion pass did or would do."""
+    results = report["results"]
+    if results:
+        print(f"{'Would convert' if dry_run else 'Converted'} {len(results)} notes:\n")
+        for r in results:
+            print(f"  {r['path'].relative_to(vault_path)}")
+            print(f"    → {r['new_path'].name}")
+            print(f"    + title: {r['title']}")
+            print(f"    + aliases: [{r['title']}]")
+            print(f"    + tags: [{r['tag']}]")
+            if not r["rewritten"]:
+                print("    = frontmatter already up to date")
+            print()
+    else:
+        print("No notes to convert.")
+
+    if report["skipped"]:
+        print(f"Skipped {len(report['skipped'])} notes (already timestamp):")
+        for s in report["skipped"]:
+            print(f"  ⏭ {s['path'].relative_to(vault_path)}")
+        print()
+
+    if report["unchanged"]:
+        print(
+            f"Unchanged since last run: {report['unchanged']} notes "
+            "(use --full to redo)"
+        )
+        print()
+
+    if report["links"]:
+        total_links = sum(r["links"] for r in report["links"])
+        verb = "Would rewrite" if dry_run else "Rewrote"
+        print(f"{verb} {total_links} links in {len(report['links'])} notes:")
+        for r in report["links"]:
+            print(f"  🔗 {r['path'].relative_to(vault_path)} ({r['links']})")
+        print()
+
+
+class InotifyWatcher:
+    """
+    Report notes written or moved into watched directory trees (Linux).
+    Blocks in select() between events, so an idle watcher uses no CPU.
+    """
+
+    def __init__(self, roots: list[Path], ignore: tuple[str, ...]):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._ignore = ignore
+        self._dirs: dict[int, Path] = {}
+        self._pending: list[Path] = []
+        for root in roots:
+            self._add_tree(root, queue=False)
+
+    def _add_tree(self, root: Path, queue: bool = True) -> None:
+        """
+        Watch root and its subdirectories. With queue, notes already in
+        them are reported too: a directory moved into the vault arrives
+        with its notes, and those emit no events of their own.
+        """
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), IN_WATCH_MASK
+            )
+            if wd < 0:
+                err = ctypes.get_errno()
+                print(f"Warning: Cannot watch {directory}: {os.strerror(err)}")
+                continue
+            self._dirs[wd] = directory
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if is_ignored(entry.name, self._ignore):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        elif queue:
+                            self._pending.append(Path(entry.path))
+            except OSError:
+                continue
+
+    def wait(self, timeout: float | None) -> list[Path]:
+        """Return paths touched since the last call, waiting up to timeout."""
+        if self._pending:
+            paths, self._pending = self._pending, []
+            return paths
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        data = os.read(self._fd, 64 * 1024)
+
+        paths = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                print("Warning: inotify queue overflowed, some notes may be missed")
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF):
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            if is_ignored(path.name, self._ignore):
+                continue
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(path)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                paths.append(path)
+
+        paths.extend(self._pending)
+        self._pending = []
+        return paths
+
+
+class PollWatcher:
+    """
+    Fallback watcher for systems without inotify (e.g. macOS): rescans
+    the directory trees every WATCH_POLL_INTERVAL seconds.
+    """
+
+    def __init__(self, roots: list[Path], ignore: tuple[str, ...]):
+        self._roots = roots
+        self._ignore = ignore
+        self._seen = self._snapshot()
+
+    def _snapshot(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for root in self._roots:
+            for path in walk_notes(root, self._ignore):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: float | None) -> list[Path]:
+        """Return notes new or modified since the last call."""
+        interval = WATCH_POLL_INTERVAL if timeout is None else timeout
+        time.sleep(min(interval, WATCH_POLL_INTERVAL))
+        current = self._snapshot()
+        changed = [p for p, sig in current.items() if self._seen.get(p) != sig]
+        self._seen = current
+        return changed
+
+
+def watch_vault(
+    vault_path: Path,
+    roots: list[Path],
+    options: dict,
+    manifest: dict[str, dict],
+    debounce: float,
+) -> None:
+    """
+    Convert notes as they are created or moved into the watched trees.
+    A note is converted once it has been quiet for debounce seconds, so
+    an editor's burst of saves results in a single conversion.
+    """
+    try:
+        watcher = InotifyWatcher(roots, options["ignore"])
+        kind = "inotify"
+    except (OSError, AttributeError):
+        watcher = PollWatcher(roots, options["ignore"])
+        kind = f"polling every {WATCH_POLL_INTERVAL:g}s"
+    print(f"Watching {', '.join(str(r) for r in roots)} ({kind}), Ctrl-C to stop")
+
+    manifest_path = vault_path / MANIFEST_NAME
+    link_index = LinkIndex(vault_path, options["ignore"])
+    if options["links"]:
+        link_index.refresh()
+    pending: dict[Path, float] = {}
+    while True:
+        now = time.monotonic()
+        timeout = max(0.0, min(pending.values()) - now) if pending else None
+        for path in watcher.wait(timeout):
+            if path.suffix == ".md":
+                pending[path] = time.monotonic() + debounce
+
+        now = time.monotonic()
+        due = sorted(p for p, deadline in pending.items() if deadline <= now)
+        for path in due:
+            del pending[path]
+        # Our own renames and rewrites show up as events too; notes that
+        # are gone or already converted drop out in plan_note
+        due = [p for p in due if p.is_file()]
+        if not due:
+            continue
+
+        report = convert_notes(
+            vault_path, due, options, manifest, manifest, link_index=link_index
+        )
+        report["skipped"] = []
+        report["results"] = [
+            r for r in report["results"] if r["rewritten"] or r["new_path"] != r["path"]
+        ]
+        if not report["results"]:
+            continue
+        print(time.strftime("[%H:%M:%S]"))
+        print_report(vault_path, report, options["dry_run"])
+        if not options["dry_run"]:
+            save_manifest(manifest_path, manifest)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Convert Obsidian notes to Zettelkasten naming convention."
@@ -202,12 +1250,68 @@ def main():
         action="store_true",
         help="Update frontmatter of existing timestamp files",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parallel worker processes, 0 for one per CPU (default: 1)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help=f"Ignore {MANIFEST_NAME} when skipping and reprocess every note",
+    )
+    parser.add_argument(
+        "--no-links",
+        action="store_true",
+        help="Do not rewrite [[links]] to renamed notes",
+    )
+    parser.add_argument(
+        "--ignore",
+        nargs="+",
+        default=[],
+        metavar="PATTERN",
+        help=f"Extra names to skip (always: {' '.join(IGNORE_PATTERNS)})",
+    )
+    parser.add_argument(
+        "--tag",
+        action="append",
+        default=[],
+        metavar="DIR=TAG",
+        help="Tag for a subdirectory, e.g. notes/projects=🚧 (repeatable)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Finish a run interrupted mid-way, using {JOURNAL_NAME}",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and convert notes as they arrive (inotify on Linux)",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=WATCH_DEBOUNCE,
+        help=f"Seconds a note must be quiet before --watch converts it "
+        f"(default: {WATCH_DEBOUNCE:g})",
+    )
 
     args = parser.parse_args()
 
     vault_path = args.vault.expanduser().resolve()
     dry_run = not args.execute
     update_existing = args.update_existing
+    jobs = args.jobs or os.cpu_count() or 1
+    ignore = IGNORE_PATTERNS + tuple(args.ignore)
+
+    dir_tags = dict(DIR_TAGS)
+    for spec in args.tag:
+        rel_dir, sep, tag = spec.partition("=")
+        if not sep or not tag:
+            parser.error(f"--tag expects DIR=TAG, got: {spec}")
+        dir_tags[rel_dir.strip("/")] = tag
 
     if not vault_path.exists():
         print(f"Error: Vault path does not exist: {vault_path}")
@@ -220,43 +1324,81 @@ def main():
         print("Update existing: YES")
     print()
 
-    results = []
-    skipped = []
+    options = {
+        "dry_run": dry_run,
+        "update_existing": update_existing,
+        "jobs": jobs,
+        "ignore": ignore,
+        "dir_tags": dir_tags,
+        "links": not args.no_links,
+        "full": args.full,
+    }
+
+    manifest_path = vault_path / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+    # Keep entries for directories not processed in this run
+    new_manifest = {
+        key: entry
+        for key, entry in manifest.items()
+        if key.split("/", 1)[0] not in args.dirs
+    }
 
+    roots = []
     for dir_name in args.dirs:
         dir_path = vault_path / dir_name
-        if not dir_path.exists():
+        if dir_path.is_dir():
+            roots.append(dir_path)
+        else:
             print(f"Warning: Directory not found: {dir_path}")
-            continue
 
-        for md_file in dir_path.glob("*.md"):
-            result = convert_note(md_file, dir_name, dry_run, update_existing)
-            if result:
-                if result.get("skipped"):
-                    skipped.append(result)
-                else:
-                    results.append(result)
-
-    # Print results
-    if results:
-        print(f"{'Would convert' if dry_run else 'Converted'} {len(results)} notes:\n")
-        for r in results:
-            print(f"  {r['path'].name}")
-            print(f"    → {r['new_path'].name}")
-            print(f"    + title: {r['title']}")
-            print(f"    + aliases: [{r['title']}]")
-            print(f"    + tags: [{r['tag']}]")
+    journal_path = vault_path / JOURNAL_NAME
+    journal = None
+    resume = None
+    interrupted = journal_path.exists()
+    if interrupted and dry_run:
+        print(f"Warning: {JOURNAL_NAME} found, an earlier run was interrupted")
+        print()
+    elif interrupted and not args.resume:
+        print(f"Error: {JOURNAL_NAME} found, an earlier run was interrupted.")
+        print("Run again with --resume to finish it.")
+        sys.exit(1)
+    if not dry_run:
+        # Taking the journal's lock first keeps two runs out of one vault
+        try:
+            journal = Journal(journal_path, vault_path)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        if interrupted:
+            resume = load_journal(journal_path, vault_path)
+            print(f"Resuming: {len(resume[0])} notes left from the interrupted run")
             print()
-    else:
-        print("No notes to convert.")
 
-    if skipped:
-        print(f"Skipped {len(skipped)} notes (already timestamp):")
-        for s in skipped:
-            print(f"  ⏭ {s['path'].name}")
-        print()
+    paths = (md_file for root in roots for md_file in walk_notes(root, ignore))
+    try:
+        report = convert_notes(
+            vault_path, paths, options, manifest, new_manifest, journal, resume
+        )
+    except KeyboardInterrupt:
+        if journal:
+            journal.close()
+            print("\nInterrupted. Run again with --resume to continue.")
+        sys.exit(130)
+
+    if not dry_run:
+        save_manifest(manifest_path, new_manifest)
+        journal.remove()
+
+    print_report(vault_path, report, dry_run)
+
+    if args.watch:
+        try:
+            watch_vault(vault_path, roots, options, new_manifest, args.debounce)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+        return
 
-    if dry_run and results:
+    if dry_run and report["results"]:
         print("---")
         print("Dry run complete. Use --execute to apply changes.")
 
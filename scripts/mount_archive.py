@@ -1,81 +1,411 @@
 #!/usr/bin/env python3
+import argparse
+import errno
+import json
 import os
+import select
+import selectors
+import signal
+import socket
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlsplit
 
+# Optional "timeout" per volume overrides MOUNT_TIMEOUT (seconds)
 VOLUMES = [
     {"volume": "smb://macmini/archive", "mount_point": "/Volumes/archive"},
     # {"volume": "smb://macmini/photography", "mount_point": "/Volumes/photography"},
 ]
-LOG_FILE = os.path.expanduser("~/Library/Logs/mount_network_drives.log")
+if sys.platform == "darwin":
+    LOG_DIR = os.path.expanduser("~/Library/Logs")
+    CACHE_DIR = os.path.expanduser("~/Library/Caches")
+else:
+    LOG_DIR = os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state")
+    CACHE_DIR = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+LOG_FILE = os.path.join(LOG_DIR, "mount_network_drives.log")
+MOUNT_TIMEOUT = 30
+SMB_PORT = 445
+PROBE_TIMEOUT = 2
+# Probe results are reused for this long across invocations
+REACHABILITY_CACHE = os.path.join(CACHE_DIR, "mount_network_drives_reachability.json")
+REACHABILITY_TTL = 60
+# Supervisor: retry delays grow from BACKOFF_BASE up to BACKOFF_MAX
+BACKOFF_BASE = 5
+BACKOFF_MAX = 600
+# Where the mount table cannot be watched, check it this often
+SUPERVISE_INTERVAL = 30
+MOUNTINFO = "/proc/self/mountinfo"
+
+_log_lock = threading.Lock()
 
 
 def log(msg, level="INFO"):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_msg = f"[{timestamp}] [{level}] {msg}\n"
 
-    # Write to file
-    try:
-        with open(LOG_FILE, "a") as f:
-            f.write(log_msg)
-    except Exception as e:
-        print(f"Failed to write to log: {e}", file=sys.stderr)
+    # Volumes are mounted from several threads; keep lines whole
+    with _log_lock:
+        # Write to file
+        try:
+            with open(LOG_FILE, "a") as f:
+                f.write(log_msg)
+        except Exception as e:
+            print(f"Failed to write to log: {e}", file=sys.stderr)
 
-    # Also print to stdout for launchd logs
-    print(log_msg.strip())
+        # Also print to stdout for launchd logs
+        print(log_msg.strip(), flush=True)
 
 
 def is_mounted(mount_point):
     return os.path.ismount(mount_point)
 
 
-def is_host_reachable(host="macmini", timeout=2):
-    """Check if host is reachable via ping."""
+def volume_host(volume):
+    """Host name from a volume URL such as smb://macmini/archive."""
+    return urlsplit(volume).hostname
+
+
+def host_candidates(host):
+    """Names to try for host; bare names may only resolve via mDNS."""
+    if "." in host:
+        return [host]
+    return [host, f"{host}.local"]
+
+
+def load_reachability_cache():
     try:
-        result = subprocess.run(
-            ["ping", "-c", "1", "-W", str(timeout * 1000), host],
-            capture_output=True,
-            timeout=timeout + 1,
-        )
-        return result.returncode == 0
-    except (subprocess.TimeoutExpired, Exception):
-        return False
+        with open(REACHABILITY_CACHE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_reachability_cache(cache):
+    tmp = f"{REACHABILITY_CACHE}.tmp"
+    try:
+        os.makedirs(os.path.dirname(REACHABILITY_CACHE), exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp, REACHABILITY_CACHE)
+    except OSError as e:
+        log(f"Failed to write reachability cache: {e}", "DEBUG")
+
+
+def resolve_addresses(name):
+    try:
+        infos = socket.getaddrinfo(name, SMB_PORT, type=socket.SOCK_STREAM)
+    except OSError:
+        return []
+    return [(family, sockaddr) for family, _, _, _, sockaddr in infos]
+
+
+def probe_hosts(hosts, timeout=PROBE_TIMEOUT):
+    """Check which hosts accept TCP connections on the SMB port.
+
+    Names are resolved in parallel, then one non-blocking connect per
+    address is started and all of them are awaited together, so probing
+    several hosts takes as long as the slowest one, bounded by timeout.
+    """
+    deadline = time.monotonic() + timeout
+    names = {name: host for host in hosts for name in host_candidates(host)}
+    reachable = dict.fromkeys(hosts, False)
+
+    # Daemon threads, so lookups still hanging at the deadline are simply
+    # abandoned; executor threads would be joined on shutdown and at exit
+    resolved = {}
+
+    def resolve(name):
+        resolved[name] = resolve_addresses(name)
+
+    threads = [
+        threading.Thread(target=resolve, args=(name,), daemon=True) for name in names
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(max(0, deadline - time.monotonic()))
+    addresses = dict(resolved)
+
+    selector = selectors.DefaultSelector()
+    try:
+        for name, addrs in addresses.items():
+            for family, sockaddr in addrs:
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                err = sock.connect_ex(sockaddr)
+                if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    sock.close()
+                    continue
+                selector.register(sock, selectors.EVENT_WRITE, names[name])
+
+        while selector.get_map() and not all(reachable.values()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in selector.select(remaining):
+                sock = key.fileobj
+                if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    reachable[key.data] = True
+                selector.unregister(sock)
+                sock.close()
+    finally:
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        selector.close()
+
+    return reachable
+
+
+def check_hosts(hosts, timeout=PROBE_TIMEOUT, max_age=REACHABILITY_TTL):
+    """Reachability of each host, from the cache if under max_age seconds."""
+    cache = load_reachability_cache()
+    now = time.time()
+    results = {}
+    stale = []
+    for host in hosts:
+        entry = cache.get(host)
+        if entry and now - entry.get("checked", 0) < max_age:
+            results[host] = entry.get("reachable", False)
+        else:
+            stale.append(host)
+
+    if stale:
+        probed = probe_hosts(stale, timeout)
+        for host, reachable in probed.items():
+            cache[host] = {"reachable": reachable, "checked": now}
+        results.update(probed)
+        save_reachability_cache(cache)
+    return results
+
+
+def is_host_reachable(host="macmini", timeout=PROBE_TIMEOUT):
+    """Check if host accepts SMB connections."""
+    return check_hosts([host], timeout)[host]
+
+
+def osascript_command(volume, mount_point):
+    return ["osascript", "-e", f'mount volume "{volume}"']
+
 
+def fstab_command(volume, mount_point):
+    # Share, options and credentials come from the mount point's fstab entry
+    return ["mount", mount_point]
 
-def mount_volume(volume, mount_point):
+
+MOUNT_COMMANDS = {
+    "darwin": osascript_command,
+    "linux": fstab_command,
+}
+
+
+def mount_command(volume, mount_point):
+    """Command that mounts volume at mount_point on this platform."""
+    return MOUNT_COMMANDS.get(sys.platform, osascript_command)(volume, mount_point)
+
+
+def mount_volume(volume, mount_point, timeout=MOUNT_TIMEOUT):
+    """Mount a volume, giving up after timeout seconds.
+
+    Returns (status, seconds) where status is "already", "mounted",
+    "failed" or "timeout".
+    """
+    started = time.monotonic()
     if is_mounted(mount_point):
         log(f"Volume already mounted at {mount_point}", "DEBUG")
-        return
+        return "already", 0.0
 
     log(f"Attempting to mount {volume}")
     try:
         result = subprocess.run(
-            ["osascript", "-e", f'mount volume "{volume}"'],
+            mount_command(volume, mount_point),
             check=True,
             capture_output=True,
             text=True,
+            timeout=timeout,
         )
         log(f"Mounted successfully at {mount_point}", "SUCCESS")
         if result.stdout:
             log(f"Output: {result.stdout.strip()}", "DEBUG")
+        status = "mounted"
+    except subprocess.TimeoutExpired:
+        log(f"Mount timed out for {volume} after {timeout}s", "ERROR")
+        status = "timeout"
     except subprocess.CalledProcessError as e:
         error_msg = e.stderr.strip() if e.stderr else "Unknown error"
         log(f"Mount failed for {volume}: {error_msg}", "ERROR")
+        status = "failed"
     except Exception as e:
-        log(f"Unexpected error for {volume}: {str(e)}", "ERROR")
+        log(f"Unexpected error for {volume}: {e!s}", "ERROR")
+        status = "failed"
+    return status, time.monotonic() - started
+
+
+def mount_config(vol_config):
+    return mount_volume(
+        vol_config["volume"],
+        vol_config["mount_point"],
+        vol_config.get("timeout", MOUNT_TIMEOUT),
+    )
+
+
+def log_summary(results):
+    """Log one line per volume with its outcome and mount latency."""
+    width = max(len(vol_config["volume"]) for vol_config, _ in results)
+    for vol_config, (status, seconds) in results:
+        log(f"{vol_config['volume']:<{width}}  {status:<8} {seconds:6.2f}s", "SUMMARY")
 
 
 def mount_all():
-    if not is_host_reachable("macmini.local"):
-        log("Host macmini.local not reachable, skipping mount", "DEBUG")
+    hosts = sorted({volume_host(v["volume"]) for v in VOLUMES})
+    reachability = check_hosts(hosts)
+    for host in hosts:
+        if not reachability[host]:
+            log(f"Host {host} not reachable, skipping its volumes", "DEBUG")
+    volumes = [v for v in VOLUMES if reachability[volume_host(v["volume"])]]
+    if volumes:
+        log_summary(mount_volumes(volumes))
+
+
+def mount_volumes(volumes):
+    """Mount volumes concurrently; returns (vol_config, result) pairs."""
+    # Each volume has its own deadline, so one hung share cannot hold up
+    # the others
+    with ThreadPoolExecutor(max_workers=len(volumes)) as executor:
+        return list(zip(volumes, executor.map(mount_config, volumes), strict=True))
+
+
+class MountTableWatcher:
+    """Wait for mount table changes.
+
+    On Linux the kernel flags /proc/self/mountinfo with POLLPRI whenever a
+    filesystem is mounted or unmounted, so waiting costs nothing while
+    idle. Elsewhere the wait simply times out every SUPERVISE_INTERVAL.
+    """
+
+    def __init__(self):
+        self.fd = None
+        self.poller = None
+        try:
+            self.fd = os.open(MOUNTINFO, os.O_RDONLY)
+        except OSError:
+            return
+        self.drain()
+        self.poller = select.poll()
+        self.poller.register(self.fd, select.POLLPRI | select.POLLERR)
+
+    def drain(self):
+        # Reading to the end re-arms the notification
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        while os.read(self.fd, 65536):
+            pass
+
+    def wait(self, timeout):
+        """Block until the mount table changes or timeout seconds pass."""
+        if self.poller is None:
+            interval = SUPERVISE_INTERVAL if timeout is None else timeout
+            time.sleep(min(interval, SUPERVISE_INTERVAL))
+            return
+        events = self.poller.poll(None if timeout is None else timeout * 1000)
+        if events:
+            self.drain()
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+
+
+def backoff_delay(failures):
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (failures - 1))
+
+
+def supervise():
+    """Keep VOLUMES mounted, remounting dropped ones with backoff."""
+    watcher = MountTableWatcher()
+    failures = {v["volume"]: 0 for v in VOLUMES}
+    next_attempt = {v["volume"]: 0.0 for v in VOLUMES}
+    mounted = {v["volume"]: is_mounted(v["mount_point"]) for v in VOLUMES}
+
+    try:
+        while True:
+            now = time.monotonic()
+            missing = []
+            for vol_config in VOLUMES:
+                volume = vol_config["volume"]
+                is_up = is_mounted(vol_config["mount_point"])
+                if mounted[volume] and not is_up:
+                    log(f"Volume dropped at {vol_config['mount_point']}", "WARNING")
+                    failures[volume] = 0
+                    next_attempt[volume] = now
+                mounted[volume] = is_up
+                if not is_up:
+                    missing.append(vol_config)
+
+            due = [v for v in missing if next_attempt[v["volume"]] <= now]
+            if due:
+                hosts = sorted({volume_host(v["volume"]) for v in due})
+                # Probe on every retry: a cached "unreachable" would hide a
+                # host that came back until long after the backoff delay
+                reachability = check_hosts(hosts, max_age=0)
+                reachable = [v for v in due if reachability[volume_host(v["volume"])]]
+                results = mount_volumes(reachable) if reachable else []
+                if results:
+                    log_summary(results)
+                outcomes = {v["volume"]: status for v, (status, _) in results}
+
+                now = time.monotonic()
+                for vol_config in due:
+                    volume = vol_config["volume"]
+                    status = outcomes.get(volume, "unreachable")
+                    if status in ("mounted", "already"):
+                        failures[volume] = 0
+                        mounted[volume] = True
+                        continue
+                    failures[volume] += 1
+                    delay = backoff_delay(failures[volume])
+                    next_attempt[volume] = now + delay
+                    log(f"Retrying {volume} in {delay}s ({status})", "DEBUG")
+
+            # With everything mounted, sleep until the mount table changes
+            pending = [
+                next_attempt[v["volume"]] for v in VOLUMES if not mounted[v["volume"]]
+            ]
+            timeout = max(0, min(pending) - time.monotonic()) if pending else None
+            watcher.wait(timeout)
+    finally:
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mount network volumes")
+    parser.add_argument(
+        "--supervise",
+        action="store_true",
+        help="Keep running and remount volumes when they drop",
+    )
+    args = parser.parse_args()
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    if not args.supervise:
+        log("=== Script started ===")
+        mount_all()
+        log("=== Script finished ===\n")
         return
 
-    for vol_config in VOLUMES:
-        mount_volume(vol_config["volume"], vol_config["mount_point"])
+    # launchd stops jobs with SIGTERM; leave through the normal exit path
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    log("=== Supervisor started ===")
+    try:
+        supervise()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        log("=== Supervisor stopped ===\n")
 
 
 if __name__ == "__main__":
-    log("=== Script started ===")
-    mount_all()
-    log("=== Script finished ===\n")
+    main()